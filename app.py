@@ -1,9 +1,27 @@
 
+import atexit
+import os
+import time
+
 import streamlit as st
 import plotly.graph_objects as go
 import numpy as np
 import pandas as pd
 
+from hydronet.cache import SimulationCache, cache_key
+from hydronet.clog import CartridgeBank
+from hydronet.downsample import downsample
+from hydronet.ensemble import EnsembleSpec, percentile_bands, run_ensemble
+from hydronet.influence import InfluenceModel
+from hydronet.jobs import DONE, JobManager, JobQueueFull, storm_job
+from hydronet.media import MediaCache
+from hydronet.network import PipeNetwork
+from hydronet.profiling import Profiler, finish_capture, start_capture
+from hydronet.solver import ModelParams, StormEvent, simulate_storm, simulate_sweep
+from hydronet.store import StoreWriter, TimeSeriesStore
+from hydronet.surrogate import Surrogate, SurrogateSpec, solver_snapshots
+from hydronet.telemetry import CHANNELS, TelemetryBuffer, TelemetryFeed, read_csv, read_jsonl, synthetic_readings
+
 # --- SYSTEM CONFIGURATION ---
 st.set_page_config(
     page_title="Vascura HydroNet",
@@ -12,6 +30,269 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
+DEBUG = st.query_params.get("debug") == "1"
+RUN_STARTED = time.perf_counter()
+
+PLUME_CELLS = 400
+PLUME_LENGTH_KM = 15.0
+PLUME_DT = 0.025
+INTENSITY_RANGE = (5, 100)
+INTENSITY_DEFAULT = 30
+PLUME_RESOLUTIONS = (400, 10_000, 100_000, 1_000_000)
+# Finer grids run as background jobs instead of blocking the rerun
+PLUME_INLINE_CELLS = 10_000
+# What-if settings: runoff source strength relative to the baseline storm,
+# and the storm times offered (evenly spaced up to StormEvent.duration)
+SOURCE_RANGE = (0.25, 4.0)
+WHATIF_HOURS = tuple(k / 4 for k in range(1, 11))
+# Discharge x source grid of the what-if map; the surrogate answers the fine
+# grid on every slider tick, the solver fallback runs the coarse one once
+WHATIF_GRID = (96, 48)
+WHATIF_SOLVER_GRID = (24, 12)
+# About two points per pixel column of a full-width chart
+MAX_PLOT_POINTS = 2000
+# Above this many points a trace is drawn with WebGL instead of SVG
+WEBGL_POINTS = 1000
+PLUME_LAYOUT = dict(
+    template="plotly_dark",
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)',
+    xaxis_title="Network Distance (km)",
+    yaxis_title="Contaminant Density",
+    height=400
+)
+
+
+@st.cache_resource
+def simulation_cache():
+    # One cache for every session; the .npz tier survives server restarts
+    return SimulationCache(max_entries=256, disk_dir=".cache/simulations")
+
+
+@st.cache_resource
+def simulation_jobs():
+    # Shared by every session: viewers of the same storm attach to one job,
+    # and at most two solver runs use the CPU at a time
+    return JobManager(max_workers=2, max_queued=8)
+
+
+def plume_params(intensity, n_cells, params=ModelParams()):
+    # Everything a single-storm result depends on; shared by plume_profile()
+    # and plume_key() so a finished job fills the profile's cache entry
+    return dict(storm=StormEvent(intensity=float(intensity)), n_cells=n_cells, length=PLUME_LENGTH_KM,
+                dt=PLUME_DT, params=params)
+
+
+def plume_key(intensity, n_cells, params=ModelParams()):
+    return cache_key(**plume_params(intensity, n_cells, params))
+
+
+def plume_job(job, cache, intensity, n_cells, params=ModelParams()):
+    # The result lands in the simulation cache; the job keeps no copy
+    result = storm_job(job, intensity, n_cells=n_cells, length=PLUME_LENGTH_KM, params=params, dt=PLUME_DT)
+    cache.put(plume_key(intensity, n_cells, params), result)
+
+
+def plume_profile(intensity, n_cells=PLUME_CELLS, params=ModelParams()):
+    def compute():
+        x, state = simulate_storm(intensity, n_cells=n_cells, length=PLUME_LENGTH_KM, params=params, dt=PLUME_DT)
+        return {"x": x, "state": state}
+    result = simulation_cache().get_or_compute(compute, **plume_params(intensity, n_cells, params))
+    return result["x"], result["state"]
+
+
+def plume_sweep(params=ModelParams()):
+    # Every slider position in one batched solver run: C is (n_intensity, n_x)
+    lo, hi = INTENSITY_RANGE
+    def compute():
+        intensities = np.arange(lo, hi + 1)
+        x, states = simulate_sweep(intensities, n_cells=PLUME_CELLS, length=PLUME_LENGTH_KM, params=params, dt=PLUME_DT)
+        return {"x": x, "intensity": intensities, "C": states[:, 0]}
+    return simulation_cache().get_or_compute(
+        compute, sweep=INTENSITY_RANGE, storm=StormEvent(), n_cells=PLUME_CELLS, length=PLUME_LENGTH_KM,
+        dt=PLUME_DT, params=params
+    )
+
+
+@st.cache_resource
+def plume_sweep_figure():
+    # The slider animates between precomputed frames in the browser, so moving
+    # it never triggers a Streamlit rerun
+    sweep = plume_sweep()
+    x, intensities, C = sweep["x"], sweep["intensity"], sweep["C"]
+    line = dict(color='#1f6fa5', width=3)
+    start = int(np.searchsorted(intensities, INTENSITY_DEFAULT))
+    frames = [
+        go.Frame(name=str(q), data=[go.Scatter(x=x, y=C[i], fill='tozeroy', line=line, name="Concentration mg/L")])
+        for i, q in enumerate(intensities)
+    ]
+    steps = [
+        dict(
+            label=str(q),
+            method="animate",
+            args=[[str(q)], dict(mode="immediate", frame=dict(duration=0, redraw=False), transition=dict(duration=0))],
+        )
+        for q in intensities
+    ]
+    fig = go.Figure(data=frames[start].data, frames=frames)
+    fig.update_layout(
+        **PLUME_LAYOUT,
+        yaxis_range=[0, 1.05 * float(C.max())],
+        sliders=[dict(
+            active=start,
+            currentvalue=dict(prefix="Simulated Hydraulic Load (Discharge Rate): "),
+            pad=dict(t=40),
+            steps=steps,
+        )],
+    )
+    fig.update_layout(height=PLUME_LAYOUT["height"] + 80)
+    return fig
+
+
+def plume_ensemble(intensity, n_members=200, params=ModelParams()):
+    spec = EnsembleSpec(n_members=n_members, intensity=float(intensity))
+    def compute():
+        x, states, _ = run_ensemble(spec, n_cells=PLUME_CELLS, length=PLUME_LENGTH_KM, params=params, dt=PLUME_DT)
+        return {"x": x, "bands": percentile_bands(states[:, 0])}
+    return simulation_cache().get_or_compute(
+        compute, ensemble=spec, storm=StormEvent(), n_cells=PLUME_CELLS, length=PLUME_LENGTH_KM,
+        dt=PLUME_DT, params=params
+    )
+
+
+@st.cache_resource
+def plume_surrogate():
+    # Weights come from `python -m hydronet train-surrogate` and are not in
+    # the repo; without them the what-if view falls back to the solver
+    path = os.environ.get("HYDRONET_SURROGATE", ".cache/surrogate.npz")
+    if not os.path.exists(path):
+        return None
+    model = Surrogate.load(path)
+    # Weights trained for other coefficients or times would answer wrongly
+    return model if model.params == ModelParams() and model.t_min <= WHATIF_HOURS[0] else None
+
+
+def whatif_solve(intensity, source_scale, params=ModelParams()):
+    # Solver fallback: C at every WHATIF_HOURS time, (n_settings, n_hours, n_x)
+    intensity = np.atleast_1d(np.asarray(intensity, dtype=float))
+    source_scale = np.atleast_1d(np.asarray(source_scale, dtype=float))
+    def compute():
+        spec = SurrogateSpec(n_cells=PLUME_CELLS, length=PLUME_LENGTH_KM, dt=PLUME_DT, snapshots=len(WHATIF_HOURS),
+                             t_start=WHATIF_HOURS[0])
+        data = solver_snapshots(intensity, source_scale, spec, params)
+        return {"x": data["x"], "C": data["C"]}
+    return simulation_cache().get_or_compute(
+        compute, whatif=[intensity.tolist(), source_scale.tolist()], hours=WHATIF_HOURS, storm=StormEvent(),
+        n_cells=PLUME_CELLS, length=PLUME_LENGTH_KM, dt=PLUME_DT, params=params
+    )
+
+
+def whatif_profile(intensity, source_scale, hours):
+    model = plume_surrogate()
+    if model is not None:
+        return model.x, model.predict(intensity, source_scale, hours)[0]
+    result = whatif_solve(intensity, source_scale)
+    return result["x"], result["C"][0, WHATIF_HOURS.index(hours)]
+
+
+def whatif_map(hours):
+    # Peak C over the discharge x source grid: (intensity, source, peak[n_q, n_s])
+    model = plume_surrogate()
+    n_q, n_s = WHATIF_GRID if model is not None else WHATIF_SOLVER_GRID
+    intensity = np.geomspace(*INTENSITY_RANGE, n_q)
+    source = np.geomspace(*SOURCE_RANGE, n_s)
+    q, s = np.meshgrid(intensity, source, indexing="ij")
+    if model is not None:
+        C = model.predict(q, s, hours)
+    else:
+        C = whatif_solve(q.ravel(), s.ravel())["C"][:, WHATIF_HOURS.index(hours)]
+    return intensity, source, C.max(axis=1).reshape(n_q, n_s)
+
+
+@st.cache_resource
+def profiler():
+    # Rolling per-section timings shared by every session
+    return Profiler(window=200)
+
+
+def plotly_chart(fig, name):
+    # Serializing a second time costs as much as the chart itself, so
+    # payload sizes are only measured in debug sessions
+    payload_kb = len(fig.to_json()) / 1024 if DEBUG else None
+    with profiler().section(f"chart.{name}") as sample:
+        # Keyed by name: two charts may hold identical figures (the what-if
+        # profile at its defaults matches the storm profile)
+        st.plotly_chart(fig, use_container_width=True, key=name)
+        if payload_kb is not None:
+            sample["payload_kb"] = payload_kb
+
+
+def series_trace(x, y, x_range=None, **kwargs):
+    # Only the visible range, decimated to the pixel budget, is serialized,
+    # so payload size does not grow with the solver grid
+    x, y = downsample(x, y, MAX_PLOT_POINTS, x_range=x_range)
+    trace = go.Scattergl if len(x) > WEBGL_POINTS else go.Scatter
+    return trace(x=x, y=y, **kwargs)
+
+
+@st.cache_resource
+def media_cache():
+    return MediaCache(".cache/media")
+
+
+def image(path, width=960):
+    # Resized WebP variant of a repo image, generated once per content hash
+    variant = media_cache().image(path, width)
+    profiler().record("image", payload_kb=os.path.getsize(variant) / 1024)
+    return variant
+
+
+def video(path):
+    if os.path.exists(path):
+        st.video(path)
+
+
+@st.cache_resource
+def pipe_network():
+    # HYDRONET_NETWORK points at a network .npz or edge-list CSV; demo otherwise
+    path = os.environ.get("HYDRONET_NETWORK")
+    return PipeNetwork.load_file(path) if path else PipeNetwork.synthetic(2000)
+
+
+@st.cache_data
+def super_spreader_table(intensity=INTENSITY_DEFAULT, top=25):
+    ranking = InfluenceModel(pipe_network(), intensity).rank(top=top)
+    return pd.DataFrame({
+        "Node": ranking["node"],
+        "Downstream Exposure": ranking["exposure"].round(2),
+        "Outfall Influence": ranking["outfall_influence"].round(3),
+        "Load Contribution (%)": (100 * ranking["contribution"]).round(3),
+    })
+
+
+TELEMETRY_NODES = 200
+TELEMETRY_CHUNKS_PER_RERUN = 60
+
+
+@st.cache_resource
+def telemetry_feed():
+    # Replays HYDRONET_TELEMETRY (CSV or JSONL) if set, otherwise a synthetic storm;
+    # readings are also archived to HYDRONET_STORE when that is set
+    path = os.environ.get("HYDRONET_TELEMETRY")
+    if path:
+        source = read_jsonl(path) if path.endswith((".jsonl", ".json")) else read_csv(path)
+    else:
+        source = synthetic_readings(TELEMETRY_NODES, seconds=3600)
+    sinks = [CartridgeBank(TELEMETRY_NODES)]
+    store_dir = os.environ.get("HYDRONET_STORE")
+    if store_dir:
+        writer = StoreWriter(TimeSeriesStore(store_dir))
+        # Buffered readings would otherwise be lost when the server stops
+        atexit.register(writer.close)
+        sinks.append(writer)
+    return TelemetryFeed(source, TelemetryBuffer(TELEMETRY_NODES, capacity=300), sinks=sinks)
+
+
 # --- VASCURA DESIGN LANGUAGE (Custom CSS) ---
 st.markdown("""
 <style>
@@ -110,9 +391,12 @@ h3, h4 {
 """, unsafe_allow_html=True)
 
 # --- HERO SECTION ---
-st.markdown("""
+@st.cache_data
+def hero_html():
+    # Static markup with the logo inlined; built once per server
+    return f"""
 <div class="hero-container">
-<img src="vascura_logo.png" style="width:120px; margin-bottom:20px;" />
+<img src="{media_cache().data_uri("vascura_logo.png", 240)}" style="width:120px; margin-bottom:20px;" />
 
 <h1 class="hero-title">VASCURA</h1>
 <p class="hero-subtitle">HydroNet</p>
@@ -120,23 +404,14 @@ st.markdown("""
 A bio-inspired infrastructure platform that treats urban stormwater systems as living vascular networks — designed to protect ecosystems at the source.
 </p>
 </div>
-""", unsafe_allow_html=True)
+"""
 
-# --- CONSOLIDATED NAVIGATION TABS ---
-tabs = st.tabs([
-    "Home",
-    "Team",
-    "Problem",
-    "Solution",
-    "Progress",
-    "Market",
-    "Business",
-    "Video",
-    "References"
-])
+
+with profiler().section("hero"):
+    st.markdown(hero_html(), unsafe_allow_html=True)
 
 # --- TAB 1: HOME ---
-with tabs[0]:
+def render_home():
     st.markdown("<br>", unsafe_allow_html=True)
     st.header("Overview")
     st.subheader("Why Vascura?")
@@ -176,12 +451,12 @@ with tabs[0]:
 
     col1, col2 = st.columns(2)
     with col1:
-        st.image("Vascura HydroNet Innovation Image.png", caption="HydroNet Prototype Rendering", use_column_width=True)
+        st.image(image("Vascura HydroNet Innovation Image.png"), caption="HydroNet Prototype Rendering", use_column_width=True)
     with col2:
-        st.image("Vascura Team Picture.png", caption="The Vascura Team: Arjun Garg and Mohan Parthasarathy", use_column_width=True)
+        st.image(image("Vascura Team Picture.png"), caption="The Vascura Team: Arjun Garg and Mohan Parthasarathy", use_column_width=True)
 
 # --- TAB 2: TEAM ---
-with tabs[1]:
+def render_team():
     st.markdown("<br>", unsafe_allow_html=True)
     st.header("Our Team")
     st.subheader("Formation and Motivation")
@@ -216,10 +491,10 @@ with tabs[1]:
         SLA manufacturing protocols.
         """)
         st.markdown('</div>', unsafe_allow_html=True)
-    st.image("Vascura Team Picture.png", caption="The Vascura Team", use_column_width=True)
+    st.image(image("Vascura Team Picture.png", 1600), caption="The Vascura Team", use_column_width=True)
 
 # --- TAB 3: PROBLEM ---
-with tabs[2]:
+def render_problem():
     st.markdown("<br>", unsafe_allow_html=True)
     st.header("The Problem: Urban Microplastic Crisis")
     st.write("""
@@ -241,7 +516,118 @@ with tabs[2]:
     st.markdown('</div>', unsafe_allow_html=True)
 
 # --- TAB 4: SOLUTION ---
-with tabs[3]:
+def plume_chart(x, y, x_range, name="plume_profile"):
+    fig = go.Figure()
+    fig.add_trace(series_trace(x, y, x_range, fill='tozeroy', line=dict(color='#1f6fa5', width=3), name="Concentration mg/L"))
+    fig.update_layout(**PLUME_LAYOUT, xaxis_range=list(x_range))
+    plotly_chart(fig, name)
+
+
+def submit_plume_job(intensity, n_cells):
+    # Starts (or restarts a failed) fine-grid run; None when the queue is full
+    try:
+        return simulation_jobs().submit(plume_key(intensity, n_cells), plume_job, simulation_cache(), intensity, n_cells)
+    except JobQueueFull:
+        st.warning("Every simulation worker is busy. This grid will start as soon as one frees up; try again shortly.")
+        return None
+
+
+# Polls the shared background job; partial profiles stream in as it runs.
+# Only the first visit (or the retry button) submits: a failed job stays
+# failed on screen instead of being relaunched on every tick
+@st.fragment(run_every=1.0)
+def plume_job_status(intensity, n_cells, x_range):
+    key = plume_key(intensity, n_cells)
+    job = simulation_jobs().get(key)
+    if job is None:
+        job = submit_plume_job(intensity, n_cells)
+        if job is None:
+            return
+    snap = job.snapshot()
+    if snap["status"] == DONE:
+        if key in simulation_cache():
+            # Redraw the page from the cached result
+            st.rerun()
+        # Evicted from the cache since the job finished: run it again
+        simulation_jobs().discard(key)
+        job = submit_plume_job(intensity, n_cells)
+        if job is None:
+            return
+        snap = job.snapshot()
+    if snap["error"] or job.cancelled:
+        st.error(f"Simulation {snap['status']}: {snap['error'] or 'cancelled'}")
+        if st.button("Retry simulation") and submit_plume_job(intensity, n_cells) is not None:
+            st.rerun(scope="fragment")
+        return
+    partial = snap["partial"]
+    hours = float(partial["t"]) if partial else 0.0
+    st.progress(snap["progress"], text=f"Simulating {n_cells:,} cells in the background: {hours:.2f} h of storm time after {snap['elapsed_s']:.0f} s")
+    if partial:
+        plume_chart(partial["x"], partial["C"], x_range, name="plume_partial")
+
+
+def whatif_explorer():
+    st.subheader("What-If Explorer")
+    model = plume_surrogate()
+    if model is not None:
+        st.write("A physics-informed surrogate, trained offline against the solver with the transport equation as a loss term, answers every slider tick for the whole discharge and source-strength map at once.")
+    else:
+        st.write("Solver mode: no surrogate weights are installed, so the map below is a coarser grid of full solver runs.")
+    col1, col2, col3 = st.columns(3)
+    intensity = col1.slider("What-If Discharge Rate", *INTENSITY_RANGE, INTENSITY_DEFAULT)
+    source_scale = col2.slider("Runoff Source Strength (x baseline)", *SOURCE_RANGE, 1.0, step=0.05)
+    hours = col3.select_slider("Hours Into Storm", WHATIF_HOURS, value=WHATIF_HOURS[-1], format_func=lambda h: f"{h:g} h")
+    with profiler().section("plume.whatif") as sample:
+        x, profile = whatif_profile(intensity, source_scale, hours)
+        q, s, peak = whatif_map(hours)
+        sample["settings"] = peak.size
+    plume_chart(x, profile, (0.0, PLUME_LENGTH_KM), name="plume_whatif")
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(x=q, y=s, z=peak.T, colorscale="Blues", colorbar=dict(title="Peak mg/L")))
+    fig.add_trace(go.Scatter(x=[intensity], y=[source_scale], mode="markers", marker=dict(color="#f5a623", size=12, symbol="x"), name="Selected"))
+    fig.update_layout(**{**PLUME_LAYOUT, "xaxis_title": "Discharge Rate", "yaxis_title": "Source Strength (x baseline)"},
+                      xaxis_type="log", yaxis_type="log", showlegend=False)
+    plotly_chart(fig, "plume_whatif_map")
+    engine = "surrogate" if model is not None else "solver"
+    st.caption(f"Peak concentration at {hours:g} h over {peak.size:,} discharge and source settings ({engine}).")
+
+
+# Widgets inside a fragment rerun only the fragment, not the page
+@st.fragment
+def plume_explorer():
+    st.subheader("Dynamic Contaminant Plume Visualization")
+    st.write("Our Graph Neural Network treats the urban network as a vascular map to predict 'Super-Spreader' nodes.")
+    if st.toggle("Instant sweep (precomputed discharge range)", value=True):
+        plotly_chart(plume_sweep_figure(), "plume_sweep")
+    else:
+        intensity = st.slider("Simulated Hydraulic Load (Discharge Rate)", *INTENSITY_RANGE, INTENSITY_DEFAULT)
+        col1, col2 = st.columns(2)
+        n_cells = col1.select_slider("Grid Resolution (cells)", PLUME_RESOLUTIONS, value=PLUME_CELLS)
+        x_range = col2.slider("Zoom (km)", 0.0, PLUME_LENGTH_KM, (0.0, PLUME_LENGTH_KM), step=0.1)
+        if n_cells > PLUME_INLINE_CELLS and plume_key(intensity, n_cells) not in simulation_cache():
+            plume_job_status(intensity, n_cells, x_range)
+        else:
+            with profiler().section("plume.profile"):
+                x, state = plume_profile(intensity, n_cells)
+            plume_chart(x, state[0], x_range)
+    whatif_explorer()
+    st.subheader("Storm Ensemble Uncertainty")
+    st.write("Rainfall intensity, runoff source strength and diffusivity are sampled for 200 storms that are simulated together; the bands show where the plume lands across them.")
+    ens_intensity = st.slider("Ensemble Median Discharge Rate", *INTENSITY_RANGE, INTENSITY_DEFAULT, step=5)
+    with profiler().section("plume.ensemble"):
+        ensemble = plume_ensemble(ens_intensity)
+    x, bands = ensemble["x"], ensemble["bands"]
+    fig = go.Figure()
+    fig.add_trace(series_trace(x, bands[4], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+    fig.add_trace(series_trace(x, bands[0], fill='tonexty', fillcolor='rgba(31,111,165,0.15)', line=dict(width=0), name="5-95th percentile"))
+    fig.add_trace(series_trace(x, bands[3], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+    fig.add_trace(series_trace(x, bands[1], fill='tonexty', fillcolor='rgba(31,111,165,0.35)', line=dict(width=0), name="25-75th percentile"))
+    fig.add_trace(series_trace(x, bands[2], line=dict(color='#1f6fa5', width=3), name="Median mg/L"))
+    fig.update_layout(**PLUME_LAYOUT)
+    plotly_chart(fig, "plume_ensemble")
+
+
+def render_solution():
     st.markdown("<br>", unsafe_allow_html=True)
     st.header("Our Solution: Vascura HydroNet")
     st.subheader("Elevator Pitch")
@@ -256,37 +642,28 @@ with tabs[3]:
         st.write("""
         Physically, our filtration module draws inspiration from the xylem structure of gymnosperm trees. In nature, the torus-margo pit membrane allows water to flow freely while sealing off embolisms to protect the tree from cavitation [2]. We reverse-engineered this biological valve into a graded mechanical cartridge. The device features a multi-stage architecture designed to handle the chaotic hydrodynamics of storm drains. The intake utilizes a radial fin array engineered to laminarize turbulent stormwater flow. By converting turbulent flow into laminar flow, we prevent the resuspension of settled particles and allow for more efficient interception. Behind this intake, the core filtration unit is constructed from layers of torus-margo analogs. Under normal flow, water passes through highly porous margo-like strands, trapping microplastics down to the micrometer scale. However, during storm surges or when a section becomes clogged, the central torus structure shifts to open bypass channels. This passive regulation prevents the upstream flooding that causes standard mesh screens to fail. To manufacture the complex torus-margo geometry for our functional prototype, we utilize high-resolution Stereolithography (SLA) 3D printing with engineering-grade resin to achieve micrometer-scale pores. For commercial-scale production, we have designed the cartridge for high-volume injection molding using recycled Polypropylene. This ensures the units are not only cost-effective but possess the mechanical toughness to withstand hydraulic shear stress and abrasive grit during peak flow events, meeting the 'Practicality' standard for long-term urban deployment.
         """)
-        col1, col2 = st.columns(2)
-        with col1:
-            st.image("top_view_prototype.jpg", caption="Top View of Physical Prototype", use_column_width=True)
-            st.image("side_view1_prototype.jpg", caption="Side View 1 of Physical Prototype", use_column_width=True)
-        with col2:
-            st.image("side_view2_prototype.jpg", caption="Side View 2 of Physical Prototype", use_column_width=True)
-            st.image("isometric_cad.jpg", caption="Isometric CAD View", use_column_width=True)
-        st.image("back_cad.jpg", caption="Back CAD View", use_column_width=True)
-        st.video("cad_rotation.mp4")
+        # Expander bodies run on every rerun, so the gallery is only read
+        # and encoded once a viewer asks for it
+        if st.toggle("Show prototype photos and CAD renders"):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.image(image("top_view_prototype.jpg"), caption="Top View of Physical Prototype", use_column_width=True)
+                st.image(image("side_view1_prototype.jpg"), caption="Side View 1 of Physical Prototype", use_column_width=True)
+            with col2:
+                st.image(image("side_view2_prototype.jpg"), caption="Side View 2 of Physical Prototype", use_column_width=True)
+                st.image(image("isometric_cad.jpg"), caption="Isometric CAD View", use_column_width=True)
+            st.image(image("back_cad.jpg", 1600), caption="Back CAD View", use_column_width=True)
+            video("cad_rotation.mp4")
     with st.expander("Digital Software: PIXGNN Computational Core"):
         st.write("""
         Digitally, every HydroNet unit is powered by a Physics-Informed Xylem Graph Neural Network, or PIXGNN. Unlike standard black box AI which merely finds patterns in data, our model is explicitly constrained by the conservation laws of physics. We model the urban pipe network as a graph where the transport of contaminants is governed by a system of partial differential equations under fluid dynamics approximations. Simulations have shown that the software is able to effectively optimize filtration locations, reducing capital expenditure by forty to sixty percent compared to a blanket deployment.
         """)
         st.latex(r"\frac{\partial C}{\partial t} + \mathbf{u} \cdot \nabla C = D \nabla^2 C + S(x,t)")
         st.caption("The Advection-Diffusion-Source (ADS) Equation governing contaminant transport.")
-        st.subheader("Dynamic Contaminant Plume Visualization")
-        st.write("Our Graph Neural Network treats the urban network as a vascular map to predict 'Super-Spreader' nodes.")
-        intensity = st.slider("Simulated Hydraulic Load (Discharge Rate)", 5, 100, 30)
-        x = np.linspace(0, 15, 400)
-        y = (intensity / 10) * np.exp(-(x - (intensity/15))**2 / (intensity/50))
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=x, y=y, fill='tozeroy', line=dict(color='#1f6fa5', width=3), name="Concentration mg/L"))
-        fig.update_layout(
-            template="plotly_dark",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            xaxis_title="Network Distance (km)",
-            yaxis_title="Contaminant Density",
-            height=400
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        plume_explorer()
+        st.subheader("Super-Spreader Nodes")
+        st.caption("Nodes ranked by the contaminant load a unit release there carries through the network below it. Click a column to re-sort.")
+        st.dataframe(super_spreader_table(), hide_index=True, use_container_width=True)
         with st.expander("Mathematical Model"):
             st.latex(r"""
             \begin{align*}
@@ -299,7 +676,7 @@ with tabs[3]:
             """)
             st.caption("Coupled PDE system modeling fluid dynamics and pollution spread.")
         # st.image("pinn_photo1.jpg", caption="Physics-Informed Neural Network Visualization 1", use_column_width=True)
-        st.image("pinn_photo2.jpg", caption="Physics-Informed Neural Network Visualization", use_column_width=True)
+        st.image(image("pinn_photo2.jpg"), caption="Physics-Informed Neural Network Visualization", use_column_width=True)
     with st.expander("Impact and Intellectual Property"):
         st.write("""
         Our impact metrics are both quantitative and qualitative. We measure success through Capture Efficiency and hydraulic conductivity. Our laboratory simulations target a capture efficiency of over eighty percent for particles larger than fifty micrometers, with less than a twenty percent reduction in flow rate. Beyond these basics, our core metrics now include kilograms of microplastics captured per year, the percentage conversion yield of waste to biochar and graphene, total reduction in pollutant load, operational uptime of filter units, and the growth of recurring subscription customers for data-driven monitoring. This tracking allows us to validate that we are removing tire wear particles containing 6PPD-quinone, directly restoring ecosystem health and protecting biodiversity [8].
@@ -320,7 +697,7 @@ with tabs[3]:
         st.write("• **Modular Integration:** Designed for rapid retrofitting into municipal storm drains.")
 
 # --- TAB 5: PROGRESS ---
-with tabs[4]:
+def render_progress():
     st.markdown("<br>", unsafe_allow_html=True)
     st.header("Validation and Progress")
     st.write("""
@@ -332,7 +709,7 @@ with tabs[4]:
     """)
 
 # --- TAB 6: MARKET ---
-with tabs[5]:
+def render_market():
     st.markdown("<br>", unsafe_allow_html=True)
     st.header("Market Analysis")
     st.write("""
@@ -382,7 +759,37 @@ with tabs[5]:
         st.write("• Distribution through existing maintenance contracts.")
 
 # --- TAB 7: BUSINESS ---
-with tabs[6]:
+@st.fragment
+def telemetry_dashboard():
+    feed = telemetry_feed()
+    st.button("Pull latest readings")
+    feed.pump(max_chunks=TELEMETRY_CHUNKS_PER_RERUN)
+    buffer = feed.buffer
+    stats = buffer.window_stats()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Nodes Reporting", int((stats["count"] > 0).sum()))
+    col2.metric("Readings Ingested", f"{buffer.ingested:,}")
+    col3.metric("Buffer Memory", f"{buffer.nbytes / 2**20:.1f} MB")
+    node_df = pd.DataFrame({"Node": np.arange(buffer.n_nodes), "Readings": stats["count"]})
+    for k, name in enumerate(CHANNELS):
+        node_df[f"{name.title()} (mean)"] = stats["mean"][:, k].round(2)
+        node_df[f"{name.title()} (latest)"] = stats["latest"][:, k].round(2)
+    node_df = node_df.sort_values("Turbidity (mean)", ascending=False).head(10)
+    st.caption("Highest-turbidity nodes over the last 5 minutes of readings.")
+    st.dataframe(node_df, hide_index=True, use_container_width=True)
+    st.subheader("Maintenance Queue")
+    queue = feed.sinks[0].maintenance_queue(limit=10)
+    queue_df = pd.DataFrame({
+        "Node": queue["node"],
+        "Hours to Bypass": queue["hours_to_bypass"].round(1),
+        "Cartridge Saturation (%)": (100 * queue["saturation"]).round(1),
+        "Head Loss (m)": queue["head_loss_m"].round(3),
+    })
+    st.caption("Cartridges ranked by forecast time until the torus opens the bypass channels at design flow; 0 means it would bypass in the next storm.")
+    st.dataframe(queue_df, hide_index=True, use_container_width=True)
+
+
+def render_business():
     st.markdown("<br>", unsafe_allow_html=True)
     st.header("Business Model")
     st.write("""
@@ -403,9 +810,11 @@ with tabs[6]:
     }
     rev_df = pd.DataFrame(revenue_data)
     st.table(rev_df)
+    with st.expander("Digital Twin Dashboard (Live Telemetry)"):
+        telemetry_dashboard()
 
 # --- TAB 8: FUNDRAISING ---
-# with tabs[7]:
+# def render_fundraising():
 #     st.markdown("<br>", unsafe_allow_html=True)
 #     st.header("Fundraising and Resources")
 #     st.write("""
@@ -423,7 +832,7 @@ with tabs[6]:
 #     st.write("**Total: $937.00**")
 
 # --- TAB 9: VIDEO ---
-with tabs[7]:
+def render_video():
     st.markdown("<br>", unsafe_allow_html=True)
     st.header("Pitch Video")
     st.write("""
@@ -435,7 +844,7 @@ with tabs[7]:
     """)
 
 # --- TAB 10: REFERENCES ---
-with tabs[8]:
+def render_references():
     st.markdown("<br>", unsafe_allow_html=True)
     st.header("References and Attachments")
     st.subheader("Citations")
@@ -460,6 +869,54 @@ with tabs[8]:
     # st.write("• Vascura HydroNet Supplementals.pdf")
     # st.write("• Vascura HydroNet References.pdf")
 
+# --- PAGE REGISTRY ---
+PAGES = {
+    "Home": render_home,
+    "Team": render_team,
+    "Problem": render_problem,
+    "Solution": render_solution,
+    "Progress": render_progress,
+    "Market": render_market,
+    "Business": render_business,
+    "Video": render_video,
+    "References": render_references,
+}
+
+# ?debug=1&profile=1 captures a cProfile of the page body for download. A
+# rerun can also leave through an exception (widget changes, st.rerun() in a
+# fragment, a failing tab), so the capture is stopped in finally: a profiler
+# left enabled keeps costing time and blocks every later capture
+CAPTURE = start_capture() if DEBUG and st.query_params.get("profile") == "1" else None
+captured = None
+try:
+    # With selection tracking on, a rerun executes only the open tab's body
+    tabs = st.tabs(list(PAGES), key="page", on_change="rerun")
+    for tab, (name, render) in zip(tabs, PAGES.items()):
+        if tab.open:
+            with tab, profiler().section(f"tab.{name.lower()}"):
+                render()
+finally:
+    if CAPTURE is not None:
+        captured = finish_capture(CAPTURE)
+
+# --- DEBUG PANEL (?debug=1) ---
+profiler().record("rerun", wall_ms=1e3 * (time.perf_counter() - RUN_STARTED))
+if DEBUG:
+    with st.expander("Debug: Simulation Cache"):
+        st.json({**simulation_cache().stats(), "active_jobs": len(simulation_jobs().active())})
+    with st.expander("Debug: Section Timings"):
+        # tracemalloc is process-wide: show its current state and change it
+        # only when this viewer flips the toggle
+        st.session_state["trace_memory"] = profiler().trace_memory
+        st.toggle("Trace allocations (tracemalloc; slows every session)", key="trace_memory",
+                  on_change=lambda: setattr(profiler(), "trace_memory", st.session_state["trace_memory"]))
+        timings = pd.DataFrame.from_dict(profiler().summary(), orient="index")
+        st.caption("Rolling p50/p95 over the last 200 samples of each section. Add &profile=1 to the URL to capture a cProfile of a rerun.")
+        st.dataframe(timings.round(2), use_container_width=True)
+        if captured is not None:
+            st.download_button("Download cProfile of this rerun", captured,
+                               file_name="hydronet-rerun.prof", mime="application/octet-stream")
+
 # --- GLOBAL FOOTER ---
 st.divider()
 st.markdown("""
@@ -0,0 +1,240 @@
+"""Headless benchmarks for the app's simulation and rendering hot paths.
+
+    python benchmarks/bench.py                       # run all, print a table
+    python benchmarks/bench.py -o results.json       # also write JSON
+    python benchmarks/bench.py --baseline benchmarks/baseline.json
+    python benchmarks/bench.py --only solver --save-baseline
+
+Cases are grouped by prefix: ``app.*`` runs app.py through Streamlit's
+``AppTest`` (cold and warm, then one rerun per tab), ``solver.*`` times
+C/U/S/I/R time steps at grid sizes from 400 to 10^6 cells, ``figure.*``
+builds and serializes Plotly figures and ``table.*`` converts DataFrames to
+the Arrow bytes Streamlit ships to the browser.
+
+With ``--baseline`` every case shared with the baseline file is compared on
+its median time; a case slower than ``1 + tolerance`` times the baseline is
+a regression and the exit status is 1.
+"""
+import argparse
+import fnmatch
+import functools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from hydronet.downsample import downsample  # noqa: E402
+from hydronet.network import PipeNetwork  # noqa: E402
+from hydronet.influence import InfluenceModel  # noqa: E402
+from hydronet.solver import CUSIRSolver, StormEvent, simulate_storm  # noqa: E402
+
+SOLVER_SIZES = (400, 10_000, 100_000, 1_000_000)
+FIGURE_POINTS = (400, 10_000, 100_000)
+PAGES = ("Home", "Team", "Problem", "Solution", "Progress", "Market", "Business", "Video", "References")
+
+
+def measure(fn, repeat=5, number=1, setup=None, warmup=True):
+    """Per-call wall times of ``fn`` over ``repeat`` rounds of ``number`` calls.
+
+    One untimed call first absorbs imports and first-use allocation unless
+    ``warmup`` is false.
+    """
+    if warmup:
+        fn(setup()) if setup else fn()
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn(arg) if setup else fn()
+        times.append((time.perf_counter() - t0) / number)
+    return {
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "max_s": max(times),
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def app_cases(repeat):
+    from streamlit.testing.v1 import AppTest
+    import streamlit as st
+
+    def fresh():
+        return AppTest.from_file(str(ROOT / "app.py"), default_timeout=300)
+
+    def cold():
+        # Process-wide Streamlit caches only; the on-disk simulation tier stays
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        fresh().run()
+
+    yield "app.cold", lambda: measure(cold, repeat=1, warmup=False)
+    yield "app.warm", lambda: measure(lambda: fresh().run(), repeat=repeat)
+
+    @functools.cache
+    def session():
+        at = fresh()
+        at.run()
+        return at
+
+    def open_page(page):
+        # AppTest does not carry tab selection between runs, so pin it each time
+        at = session()
+        at.session_state["page"] = page
+        at.run()
+
+    for page in PAGES:
+        yield f"app.tab.{page.lower()}", lambda page=page: measure(lambda: open_page(page), repeat=repeat)
+
+
+def solver_cases(repeat, sizes=SOLVER_SIZES, steps=20):
+    storm = StormEvent()
+    yield "solver.storm.400", lambda: measure(lambda: simulate_storm(30.0), repeat=repeat)
+    for n in sizes:
+        def stepped(n=n):
+            solver = CUSIRSolver(n_cells=n)
+            solver.reset(storm)
+
+            def run():
+                for _ in range(steps):
+                    solver.step()
+            result = measure(run, repeat=repeat)
+            # Report per step so sizes are comparable with full-storm timings
+            for key in ("median_s", "min_s", "max_s"):
+                result[key] /= steps
+            result["steps"] = steps
+            result["cells_per_s"] = n / result["median_s"]
+            return result
+        yield f"solver.step.{n}", stepped
+
+
+def figure_cases(repeat, sizes=FIGURE_POINTS):
+    import plotly.graph_objects as go
+
+    for n in sizes:
+        x = np.linspace(0.0, 15.0, n)
+        y = np.exp(-((x - 5.0) ** 2))
+
+        def build(x=x, y=y):
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(x=x, y=y, fill='tozeroy', name="Concentration mg/L"))
+            fig.update_layout(template="plotly_dark", height=400)
+            return fig
+
+        yield f"figure.build.{n}", lambda build=build: measure(build, repeat=repeat)
+        yield f"figure.json.{n}", lambda build=build: measure(go.Figure.to_json, repeat=repeat, setup=build)
+
+    x = np.linspace(0.0, 15.0, 1_000_000)
+    y = np.exp(-((x - 5.0) ** 2))
+    for method in ("lttb", "minmax"):
+        yield f"figure.{method}.1000000", lambda method=method: measure(lambda: downsample(x, y, 2000, method), repeat=repeat)
+
+
+def table_cases(repeat):
+    import pandas as pd
+    from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes
+
+    network = functools.cache(lambda: PipeNetwork.synthetic(2000))
+
+    def super_spreaders():
+        ranked = InfluenceModel(network()).rank(top=25)
+        return pd.DataFrame({
+            "Node": ranked["node"],
+            "Downstream Exposure": ranked["exposure"].round(2),
+            "Outfall Influence": ranked["outfall_influence"].round(3),
+            "Load Contribution (%)": (100 * ranked["contribution"]).round(3),
+        })
+
+    def wide():
+        return pd.DataFrame(np.random.default_rng(0).random((10_000, 8)), columns=list("abcdefgh"))
+
+    yield "table.super_spreaders.2000", lambda: measure(super_spreaders, repeat=repeat)
+    yield "table.arrow.super_spreaders", lambda: measure(convert_pandas_df_to_arrow_bytes, repeat=repeat, setup=super_spreaders)
+    yield "table.arrow.10000x8", lambda: measure(convert_pandas_df_to_arrow_bytes, repeat=repeat, setup=wide)
+
+
+def run_benchmarks(patterns=("*",), repeat=5):
+    groups = [solver_cases(repeat), figure_cases(repeat), table_cases(repeat), app_cases(max(1, repeat // 2))]
+    results = {}
+    for group in groups:
+        for name, case in group:
+            if not any(fnmatch.fnmatch(name, p) or name.startswith(p) for p in patterns):
+                continue
+            results[name] = case()
+            print(f"{name:<32} {1e3 * results[name]['median_s']:>11.3f} ms", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, tolerance=0.25):
+    """Median-time ratios against ``baseline``; regressions exceed ``1 + tolerance``."""
+    rows = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = result["median_s"] / base["median_s"] if base["median_s"] > 0 else float("inf")
+        rows.append({"name": name, "baseline_s": base["median_s"], "current_s": result["median_s"],
+                     "ratio": ratio, "regression": ratio > 1.0 + tolerance})
+    return rows
+
+
+def metadata():
+    import numpy
+    import scipy
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "scipy": scipy.__version__,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", default=["*"], help="case name prefixes or globs")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="merge results into --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)      # app.py loads its assets by relative path
+    report = {"meta": metadata(), "results": run_benchmarks(args.only, args.repeat)}
+
+    status = 0
+    if args.baseline and not args.save_baseline and Path(args.baseline).exists():
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+        report["comparison"] = compare(report["results"], baseline, args.tolerance)
+        print(f"\n{'case':<32} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+        for row in report["comparison"]:
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"{row['name']:<32} {1e3 * row['baseline_s']:>12.3f} {1e3 * row['current_s']:>12.3f} "
+                  f"{row['ratio']:>7.2f}{flag}")
+        status = int(any(row["regression"] for row in report["comparison"]))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        path = Path(args.baseline or ROOT / "benchmarks" / "baseline.json")
+        merged = json.loads(path.read_text()) if path.exists() else {"results": {}}
+        merged["meta"] = report["meta"]
+        merged["results"].update(report["results"])
+        path.write_text(json.dumps(merged, indent=2) + "\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""Computational core of the Vascura HydroNet digital twin.
+
+Submodules are imported explicitly (``from hydronet import solver``) so that
+headless tools only pay for what they use.
+"""
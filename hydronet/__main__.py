@@ -0,0 +1,5 @@
+import sys
+
+from hydronet.cli import main
+
+sys.exit(main())
@@ -0,0 +1,170 @@
+"""Bounded memoization for simulation results.
+
+:class:`SimulationCache` maps a parameter set to a dict of NumPy arrays. The
+in-memory tier is an LRU bounded by entry count and total array bytes; the
+optional disk tier stores one compressed ``.npz`` per key so results survive a
+server restart. The cache is thread-safe so one instance can be shared by all
+Streamlit sessions.
+"""
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from hydronet.solver import SOLVER_VERSION
+
+
+def _canonical(value):
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {type(value).__name__: _canonical(dataclasses.asdict(value))}
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.ndarray):
+        # repr() elides the middle of large arrays, so hash the contents
+        data = np.ascontiguousarray(value)
+        return {"ndarray": [data.dtype.str, list(data.shape), hashlib.sha256(data.tobytes()).hexdigest()]}
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    raise TypeError(f"cannot build a cache key from {type(value).__name__} values")
+
+
+def cache_key(**params):
+    """Stable hex digest of keyword parameters.
+
+    Values may be numbers, strings, ``None``, NumPy arrays and scalars,
+    dataclasses, and lists, tuples and dicts of those; anything else raises
+    ``TypeError``. :data:`~hydronet.solver.SOLVER_VERSION` is always part
+    of the key.
+    """
+    params = {**params, "solver_version": SOLVER_VERSION}
+    blob = json.dumps(_canonical(params), sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()[:32]
+
+
+class SimulationCache:
+    """LRU cache of ``{name: ndarray}`` results with an optional ``.npz`` tier."""
+
+    def __init__(self, max_entries=128, max_bytes=256 * 2**20, disk_dir=None, max_disk_entries=2048):
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_disk_entries = int(max_disk_entries)
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        if key in self._entries:
+            return True
+        path = self._disk_path(key)
+        return path is not None and path.exists()
+
+    def _disk_path(self, key):
+        return self.disk_dir / f"{key}.npz" if self.disk_dir is not None else None
+
+    def _remember(self, key, arrays):
+        # Caller holds the lock
+        if key in self._entries:
+            self._bytes -= sum(a.nbytes for a in self._entries.pop(key).values())
+        self._entries[key] = arrays
+        self._bytes += sum(a.nbytes for a in arrays.values())
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._bytes > self.max_bytes):
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= sum(a.nbytes for a in old.values())
+            self.evictions += 1
+
+    def get(self, key):
+        """Return the cached arrays for ``key`` or ``None``."""
+        with self._lock:
+            arrays = self._entries.get(key)
+            if arrays is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return arrays
+        path = self._disk_path(key)
+        if path is not None and path.exists():
+            try:
+                with np.load(path) as data:
+                    arrays = {name: data[name] for name in data.files}
+            except (OSError, ValueError):
+                path.unlink(missing_ok=True)
+            else:
+                for a in arrays.values():
+                    a.setflags(write=False)
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(key, arrays)
+                return arrays
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, arrays):
+        arrays = {name: np.asarray(a) for name, a in arrays.items()}
+        for a in arrays.values():
+            a.setflags(write=False)
+        with self._lock:
+            self._remember(key, arrays)
+        if self.disk_dir is not None:
+            self._write_disk(key, arrays)
+        return arrays
+
+    def _write_disk(self, key, arrays):
+        # Write to a temp file and rename so readers never see a partial .npz
+        fd, tmp = tempfile.mkstemp(dir=self.disk_dir, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.savez_compressed(fh, **arrays)
+            os.replace(tmp, self._disk_path(key))
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            return
+        files = sorted(self.disk_dir.glob("*.npz"), key=lambda p: p.stat().st_mtime)
+        for stale in files[:max(0, len(files) - self.max_disk_entries)]:
+            stale.unlink(missing_ok=True)
+
+    def get_or_compute(self, compute, **params):
+        """Return cached arrays for ``params``, calling ``compute()`` on a miss.
+
+        ``compute`` must return a dict of arrays. Cached arrays are read-only.
+        """
+        key = cache_key(**params)
+        arrays = self.get(key)
+        if arrays is None:
+            arrays = self.put(key, compute())
+        return arrays
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,304 @@
+"""Headless batch runs of the network twin.
+
+    python -m hydronet forecast network.npz --intensity 10 30 60 -o out/
+    python -m hydronet forecast network.csv --scenarios storms.csv -o out/ -j 16
+    python -m hydronet train-surrogate -o .cache/surrogate.npz
+    python -m hydronet check-surrogate .cache/surrogate.npz
+
+Every scenario runs the network transport model through one storm and
+feeds the resulting node flows and concentrations to a bank of cartridges,
+then forecasts time-to-bypass. Scenarios run in a process pool that
+receives the network once, at worker start-up. Per-scenario arrays go to
+``OUT/scenarios/<name>.npz`` (compressed, float32) and one row per scenario
+to ``OUT/summary.csv``.
+
+The scenarios CSV needs a header with ``name`` and ``intensity`` columns and
+may add ``duration_h`` and ``saturation`` (initial cartridge saturation).
+Names become file names, so they are limited to letters, digits, ``.``,
+``_`` and ``-``. Every row is checked before anything runs: intensity and
+duration must be positive and saturation between 0 and 1.
+
+``train-surrogate`` fits the plume surrogate (:mod:`hydronet.surrogate`) to
+solver runs and writes its weights; ``check-surrogate`` compares a weights
+file against fresh solver runs and exits 1 when it misses ``--tolerance``.
+
+Heavy imports (NumPy, SciPy and the model modules) happen inside the
+commands, never at module import, and Streamlit and Plotly are not used.
+"""
+import argparse
+import csv
+import math
+import os
+import re
+import sys
+import time
+
+SUMMARY_FIELDS = (
+    "scenario", "intensity", "duration_h", "peak_outfall_load_mg_s", "outfall_mass_kg",
+    "peak_node_concentration", "nodes_bypass_24h", "min_hours_to_bypass", "runtime_s",
+)
+
+# Scenario names become file names under OUT/scenarios/
+SCENARIO_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]{0,127}")
+
+# Worker-side network and settings, set by _init_worker()
+_WORKER = {}
+
+
+def read_scenarios(path):
+    """Scenario dicts (``name``, ``intensity``, optional extras) from a CSV."""
+    scenarios = []
+    with open(path, newline="") as fh:
+        reader = csv.DictReader(fh)
+        if reader.fieldnames is not None and not {"name", "intensity"} <= set(reader.fieldnames):
+            raise ValueError(f"{path} needs 'name' and 'intensity' columns")
+        for row in reader:
+            # Short rows leave missing fields as None
+            try:
+                scenario = {"name": row["name"].strip(), "intensity": float(row["intensity"])}
+                for field in ("duration_h", "saturation"):
+                    if row.get(field):
+                        scenario[field] = float(row[field])
+            except (AttributeError, TypeError, ValueError):
+                raise ValueError(f"{path}, line {reader.line_num}: expected a name and numeric "
+                                 "intensity[, duration_h, saturation]") from None
+            scenarios.append(scenario)
+    return scenarios
+
+
+def check_scenarios(scenarios):
+    """Raise ``ValueError`` unless every scenario can run and be written out."""
+    if not scenarios:
+        raise ValueError("no scenarios given; pass --intensity or --scenarios")
+    names = [s["name"] for s in scenarios]
+    bad = [name for name in names if not SCENARIO_NAME.fullmatch(name)]
+    if bad:
+        raise ValueError(f"invalid scenario names {bad}: use letters, digits, '.', '_' or '-',"
+                         " starting with a letter or digit")
+    if len(set(names)) != len(names):
+        raise ValueError("scenario names must be unique")
+    limits = (
+        ("intensity", lambda v: v > 0, "must be positive"),
+        ("duration_h", lambda v: v > 0, "must be positive"),
+        ("saturation", lambda v: 0 <= v <= 1, "must be between 0 and 1"),
+    )
+    for field, ok, rule in limits:
+        bad = [s["name"] for s in scenarios
+               if field in s and not (math.isfinite(s[field]) and ok(s[field]))]
+        if bad:
+            raise ValueError(f"{field} {rule} (scenarios {bad})")
+
+
+def _init_worker(network, out_dir, dt, dx_km):
+    _WORKER.update(network=network, out_dir=out_dir, dt=dt, dx_km=dx_km)
+
+
+def run_scenario(network, scenario, dt=0.025, dx_km=0.05):
+    """Transport plus cartridge forecast for one scenario.
+
+    Returns ``(summary, arrays)``: a dict of :data:`SUMMARY_FIELDS` and a
+    dict of per-node and per-step float32 arrays.
+    """
+    import numpy as np
+
+    from hydronet.clog import CartridgeBank
+    from hydronet.network import NetworkTransport
+    from hydronet.solver import StormEvent
+    from hydronet.telemetry import READING_DTYPE
+
+    start = time.perf_counter()
+    net = network
+    intensity = float(scenario["intensity"])
+    storm = StormEvent(intensity=intensity, duration=float(scenario.get("duration_h", StormEvent.duration)))
+    transport = NetworkTransport(net, intensity, dt=dt, dx_km=dx_km)
+    bank = CartridgeBank(net.n_nodes)
+    bank.mass[:] = float(scenario.get("saturation", 0.0)) * bank.spec.capacity_g
+
+    node_flow = transport.node_flow
+    runoff_flow = net.runoff * intensity
+    reading = np.zeros(net.n_nodes, dtype=READING_DTYPE)
+    reading["node"] = np.arange(net.n_nodes)
+    reading["flow"] = node_flow
+    n_steps = int(round(storm.duration / dt))
+    peak = np.zeros(net.n_nodes)
+    outfall_load = np.empty((n_steps, net.outfalls.size), dtype=np.float32)
+    times = np.empty(n_steps, dtype=np.float32)
+
+    for k in range(n_steps):
+        runoff_conc = storm.load_per_unit * intensity * storm.rainfall(transport.t)
+        transport.step(storm)
+        # Flow-weighted mix of arriving pipes and local runoff at each node
+        mass = np.bincount(net.dst, weights=transport.edge_flow * transport.outlet_concentration(),
+                           minlength=net.n_nodes)
+        mass += runoff_flow * runoff_conc * net.load
+        with np.errstate(divide="ignore", invalid="ignore"):
+            conc = np.where(node_flow > 0, mass / node_flow, 0.0)
+        np.maximum(peak, conc, out=peak)
+        reading["t"] = transport.t * 3600.0
+        reading["turbidity"] = conc / bank.spec.tss_per_ntu
+        bank.ingest(reading)
+        outfall_load[k] = transport.outfall_load()
+        times[k] = transport.t
+
+    hours = bank.time_to_bypass()
+    arrays = {
+        "t_h": times,
+        "outfall_nodes": net.outfalls.astype(np.int64),
+        "outfall_load_mg_s": outfall_load,
+        "peak_concentration": peak.astype(np.float32),
+        "saturation": bank.saturation.astype(np.float32),
+        "hours_to_bypass": hours.astype(np.float32),
+    }
+    total_load = outfall_load.sum(axis=1, dtype=np.float64)
+    summary = {
+        "scenario": scenario["name"],
+        "intensity": intensity,
+        "duration_h": storm.duration,
+        "peak_outfall_load_mg_s": float(total_load.max()) if n_steps else 0.0,
+        # mg/s over dt hours -> kg
+        "outfall_mass_kg": float(total_load.sum() * dt * 3600.0 * 1e-6),
+        "peak_node_concentration": float(peak.max()) if peak.size else 0.0,
+        "nodes_bypass_24h": int((hours <= 24.0).sum()),
+        "min_hours_to_bypass": float(hours.min()) if hours.size else float("inf"),
+        "runtime_s": time.perf_counter() - start,
+    }
+    return summary, arrays
+
+
+def _run_in_worker(scenario):
+    import numpy as np
+
+    summary, arrays = run_scenario(_WORKER["network"], scenario, _WORKER["dt"], _WORKER["dx_km"])
+    path = os.path.join(_WORKER["out_dir"], "scenarios", f"{scenario['name']}.npz")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as fh:
+        np.savez_compressed(fh, **arrays)
+    os.replace(tmp, path)
+    return summary
+
+
+def forecast(args):
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    from hydronet.network import PipeNetwork
+
+    if args.scenarios:
+        scenarios = read_scenarios(args.scenarios)
+    else:
+        scenarios = [{"name": f"q{q:g}", "intensity": q} for q in args.intensity]
+    if args.saturation is not None:
+        for scenario in scenarios:
+            scenario.setdefault("saturation", args.saturation)
+    check_scenarios(scenarios)
+    names = [s["name"] for s in scenarios]
+
+    # Loaded once here so a bad file fails fast; forked workers inherit it
+    network = PipeNetwork.load_file(args.network)
+    os.makedirs(os.path.join(args.output, "scenarios"), exist_ok=True)
+    workers = min(args.jobs or os.cpu_count() or 1, len(scenarios))
+    summaries = {}
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(network, args.output, args.dt, args.dx_km)) as pool:
+        futures = {pool.submit(_run_in_worker, s): s["name"] for s in scenarios}
+        for done, future in enumerate(as_completed(futures), 1):
+            name = futures[future]
+            try:
+                summaries[name] = future.result()
+            except Exception as exc:    # one bad scenario must not sink the batch
+                failed += 1
+                print(f"[{done}/{len(scenarios)}] {name}: failed: {type(exc).__name__}: {exc}", file=sys.stderr)
+                continue
+            if not args.quiet:
+                print(f"[{done}/{len(scenarios)}] {name}: {summaries[name]['runtime_s']:.1f} s", file=sys.stderr)
+
+    with open(os.path.join(args.output, "summary.csv"), "w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        for name in names:
+            if name in summaries:
+                writer.writerow(summaries[name])
+    return 1 if failed else 0
+
+
+def train_surrogate(args):
+    from hydronet.surrogate import SurrogateSpec, check, train
+
+    overrides = {"iterations": args.iterations, "physics_weight": args.physics_weight}
+    spec = SurrogateSpec(seed=args.seed, **{k: v for k, v in overrides.items() if v is not None})
+
+    def log(iteration, data_loss, physics_loss):
+        if not args.quiet:
+            print(f"[{iteration}/{spec.iterations}] data {data_loss:.3e}  physics {physics_loss:.3e}",
+                  file=sys.stderr)
+
+    model = train(spec, log=log)
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = args.output + ".tmp"
+    with open(tmp, "wb") as fh:
+        model.save(fh)
+    os.replace(tmp, args.output)
+    _print_check(check(model))
+    return 0
+
+
+def check_surrogate(args):
+    from hydronet.surrogate import Surrogate, check
+
+    report = check(Surrogate.load(args.weights), n_members=args.members, seed=args.seed)
+    _print_check(report)
+    return 0 if report["rel_l2_max"] <= args.tolerance else 1
+
+
+def _print_check(report):
+    print(f"members           {report['members']}")
+    print(f"relative L2 mean  {report['rel_l2_mean']:.4f}")
+    print(f"relative L2 max   {report['rel_l2_max']:.4f}  (t = {report['worst_t_h']:.2f} h)")
+    print(f"max error / peak  {report['max_abs_error_frac']:.4f}")
+    print(f"solver            {report['solver_s'] * 1e3:.1f} ms")
+    print(f"surrogate         {report['surrogate_s'] * 1e3:.2f} ms")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m hydronet", description="Headless HydroNet twin runs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("forecast", help="run transport and cartridge forecasts for storm scenarios")
+    p.add_argument("network", help="network file (.npz or edge-list .csv)")
+    source = p.add_mutually_exclusive_group(required=True)
+    source.add_argument("--intensity", type=float, nargs="+", help="one scenario per discharge intensity")
+    source.add_argument("--scenarios", help="scenario CSV (name,intensity[,duration_h,saturation])")
+    p.add_argument("-o", "--output", required=True, help="output directory")
+    p.add_argument("-j", "--jobs", type=int, help="worker processes (default: all cores)")
+    p.add_argument("--saturation", type=float, help="initial cartridge saturation for every scenario")
+    p.add_argument("--dt", type=float, default=0.025, help="time step (h)")
+    p.add_argument("--dx-km", type=float, default=0.05, help="pipe cell length (km)")
+    p.add_argument("-q", "--quiet", action="store_true")
+    p.set_defaults(func=forecast)
+
+    p = commands.add_parser("train-surrogate", help="fit the plume surrogate to solver runs")
+    p.add_argument("-o", "--output", required=True, help="weights file (.npz)")
+    p.add_argument("--iterations", type=int, help="optimizer steps (default: the spec's)")
+    p.add_argument("--physics-weight", type=float, help="weight of the PDE residual loss (default: the spec's)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("-q", "--quiet", action="store_true")
+    p.set_defaults(func=train_surrogate)
+
+    p = commands.add_parser("check-surrogate", help="compare surrogate weights against the solver")
+    p.add_argument("weights", help="weights file written by train-surrogate")
+    p.add_argument("--members", type=int, default=64, help="random settings to compare")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--tolerance", type=float, default=0.1, help="largest acceptable relative L2 error")
+    p.set_defaults(func=check_surrogate)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
@@ -0,0 +1,89 @@
+"""Decimation of long series to a plotting budget.
+
+Charts only need about as many points as the plot has pixel columns, so
+series are cut to the visible x range and decimated before serialization.
+Two selectors are provided, both returning indices into the input:
+
+* Largest-Triangle-Three-Buckets (LTTB): one point per bucket, chosen to
+  maximise the triangle area formed with the previously kept point and the
+  mean of the next bucket. Preserves the visual shape of smooth curves.
+* min/max bucketing: the lowest and highest point of each bucket. Fully
+  vectorized and never drops a spike.
+
+``x`` must be sorted ascending.
+"""
+import numpy as np
+
+
+def visible_slice(x, x_range=None):
+    """Slice of ``x`` covering ``x_range``, plus one point either side."""
+    if x_range is None:
+        return slice(0, len(x))
+    lo, hi = x_range
+    start = max(int(np.searchsorted(x, lo, side="left")) - 1, 0)
+    stop = min(int(np.searchsorted(x, hi, side="right")) + 1, len(x))
+    return slice(start, stop)
+
+
+def lttb_indices(x, y, n_out):
+    """Indices of the ``n_out`` points LTTB keeps (endpoints always kept)."""
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("LTTB keeps both endpoints and needs n_out >= 3")
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n_buckets = n_out - 2
+    # Interior points split into near-equal buckets
+    edges = 1 + (np.arange(n_buckets + 1) * (n - 2)) // n_buckets
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    mean_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    # The bucket after the last one is the final point itself
+    mean_x = np.append(mean_x, x[-1])
+    mean_y = np.append(mean_y, y[-1])
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for b in range(n_buckets):
+        lo, hi = edges[b], edges[b + 1]
+        ax, ay = x[a], y[a]
+        cx, cy = mean_x[b + 1], mean_y[b + 1]
+        # Twice the triangle area; the constant factor does not change argmax
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        a = lo + int(area.argmax())
+        keep[b + 1] = a
+    return keep
+
+
+def minmax_indices(y, n_out):
+    """Indices of each bucket's minimum and maximum, about ``n_out`` in total."""
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n_out >= n:
+        return np.arange(n)
+    size = -(-n // n_buckets)
+    # Pad by repeating the last value so the buckets reshape evenly
+    padded = np.concatenate([y, np.repeat(y[-1:], n_buckets * size - n)]).reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    picks = np.concatenate([offsets + padded.argmin(axis=1), offsets + padded.argmax(axis=1), [0, n - 1]])
+    return np.unique(np.minimum(picks, n - 1))
+
+
+def downsample(x, y, n_out=2000, method="lttb", x_range=None):
+    """``(x, y)`` restricted to ``x_range`` and decimated to about ``n_out`` points."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    window = visible_slice(x, x_range)
+    x, y = x[window], y[window]
+    if len(x) <= n_out:
+        return x, y
+    if method == "lttb":
+        keep = lttb_indices(x, y, n_out)
+    elif method == "minmax":
+        keep = minmax_indices(y, n_out)
+    else:
+        raise ValueError(f"unknown downsampling method {method!r}; expected 'lttb' or 'minmax'")
+    return x[keep], y[keep]
@@ -0,0 +1,95 @@
+"""Monte Carlo storm ensembles on the batched C/U/S/I/R solver.
+
+Each member draws a discharge intensity, a runoff source strength and a
+diffusivity multiplier from lognormal distributions. Members advance
+together as the batch axis of a :class:`CUSIRSolver`, in blocks of about
+:data:`BLOCK_CELLS` cells so each step's working set stays in cache.
+
+Batching removes per-run Python overhead, not per-member arithmetic: the
+tridiagonal diffusion solves are sequential in each member and cost the
+same batched or not. A batched ensemble is about twice as fast as
+sequential runs on the app's 400-cell grid and roughly even on fine grids;
+500 members cost about 200 single runs, not a few.
+
+Diffusivity is sampled by stratification: the lognormal is cut into
+``diffusion_levels`` equal-probability strata, each member takes its
+stratum's median, and members are ordered by stratum. Each stratum is then a
+contiguous block that shares one tridiagonal factorization and one
+multi-right-hand-side solve.
+"""
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+
+from hydronet.solver import CUSIRSolver, ModelParams, StormEvent
+
+PERCENTILES = (5, 25, 50, 75, 95)
+# Cells per solver batch: beyond this a step's arrays fall out of cache and a
+# batched step costs more per member than a single run
+BLOCK_CELLS = 16_384
+
+
+@dataclass(frozen=True)
+class EnsembleSpec:
+    n_members: int = 500
+    intensity: float = 30.0         # median discharge
+    intensity_cv: float = 0.3
+    source_cv: float = 0.5
+    diffusion_cv: float = 0.3
+    diffusion_levels: int = 16
+    seed: int = 0
+
+
+def _lognormal_sigma(cv):
+    return float(np.sqrt(np.log1p(cv ** 2)))
+
+
+def sample_members(spec):
+    """Draw member parameters, ordered by diffusivity stratum.
+
+    Returns a dict of ``(n_members,)`` arrays: ``intensity``,
+    ``source_scale`` and ``diffusion_scale``.
+    """
+    rng = np.random.default_rng(spec.seed)
+    n = int(spec.n_members)
+    intensity = spec.intensity * rng.lognormal(0.0, _lognormal_sigma(spec.intensity_cv), n)
+    source = rng.lognormal(0.0, _lognormal_sigma(spec.source_cv), n)
+
+    levels = max(1, min(int(spec.diffusion_levels), n))
+    probs = (np.arange(levels) + 0.5) / levels
+    z = np.array([NormalDist().inv_cdf(p) for p in probs])
+    level_scale = np.exp(_lognormal_sigma(spec.diffusion_cv) * z)
+    # Equal-probability strata, members already in stratum order; the other
+    # draws are i.i.d. so the assignment needs no shuffling
+    labels = np.arange(n) * levels // n
+    return {
+        "intensity": intensity,
+        "source_scale": source,
+        "diffusion_scale": level_scale[labels],
+    }
+
+
+def run_ensemble(spec=EnsembleSpec(), n_cells=400, length=15.0, params=ModelParams(), dt=0.025):
+    """Advance every member through one storm in batched blocks.
+
+    Returns ``(x, states, members)`` with ``states`` shaped
+    ``(n_members, 5, n_cells)``.
+    """
+    members = sample_members(spec)
+    n = int(spec.n_members)
+    block = max(1, BLOCK_CELLS // int(n_cells))
+    states = np.empty((n, 5, n_cells))
+    for lo in range(0, n, block):
+        hi = min(lo + block, n)
+        solver = CUSIRSolver(n_cells=n_cells, length=length, params=params, dt=dt, batch=hi - lo,
+                             diffusion_scale=members["diffusion_scale"][lo:hi])
+        state = solver.run(StormEvent(), intensity=members["intensity"][lo:hi],
+                           source_scale=members["source_scale"][lo:hi])
+        states[lo:hi] = state.transpose(1, 0, 2)
+    return solver.x, states, members
+
+
+def percentile_bands(values, percentiles=PERCENTILES):
+    """Percentiles across members (axis 0) as a ``(len(percentiles), ...)`` array."""
+    return np.percentile(values, percentiles, axis=0)
@@ -0,0 +1,208 @@
+"""Background simulation jobs with progress streaming and de-duplication.
+
+:class:`JobManager` runs jobs on a bounded thread pool, so however many
+sessions submit work at most ``max_workers`` solver runs use the CPU at
+once (the solver spends its time in NumPy and LAPACK calls that release the
+GIL). Jobs are keyed by their parameters: submitting a key that is queued,
+running or recently finished returns the existing :class:`Job` instead of
+starting a duplicate, so every viewer of the same storm watches one run.
+
+A job function receives its :class:`Job` first and calls
+:meth:`Job.publish` with partial results as it goes; readers poll
+:meth:`Job.snapshot` from any thread.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from hydronet.solver import C, CUSIRSolver, ModelParams, StormEvent
+
+PENDING, RUNNING, DONE, FAILED, CANCELLED = "pending", "running", "done", "failed", "cancelled"
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function once its job has been cancelled."""
+
+
+class JobQueueFull(RuntimeError):
+    """Too many jobs are already waiting for a worker."""
+
+
+class Job:
+    """Handle on one background run, shared by everyone who submitted it."""
+
+    def __init__(self, key):
+        self.key = key
+        self.status = PENDING
+        self.progress = 0.0
+        self.partial = None
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = self.finished = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._future = None
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def publish(self, progress, **partial):
+        """Record progress in [0, 1] and the latest partial arrays.
+
+        Raises :class:`JobCancelled` when the job has been cancelled, so
+        long-running functions stop at their next update.
+        """
+        if self._cancel.is_set():
+            raise JobCancelled(self.key)
+        partial = {name: np.array(value, copy=True) for name, value in partial.items()}
+        with self._lock:
+            self.progress = float(progress)
+            self.partial = partial
+
+    def cancel(self):
+        self._cancel.set()
+        if self._future is not None and self._future.cancel():
+            self._finish(CANCELLED)
+
+    def wait(self, timeout=None):
+        """Block until the job finishes; returns whether it did."""
+        return self._done.wait(timeout)
+
+    def snapshot(self):
+        """Consistent view of status, progress and partial or final arrays."""
+        with self._lock:
+            end = self.finished or time.time()
+            return {
+                "key": self.key,
+                "status": self.status,
+                "progress": self.progress,
+                "partial": self.partial,
+                "result": self.result,
+                "error": self.error,
+                "elapsed_s": end - (self.started or end),
+            }
+
+    def _finish(self, status, result=None, error=None):
+        with self._lock:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished = time.time()
+            if status == DONE:
+                self.progress = 1.0
+        self._done.set()
+
+
+class JobManager:
+    """Bounded worker pool with jobs de-duplicated by key."""
+
+    def __init__(self, max_workers=2, max_queued=8, history=32):
+        self.max_workers = int(max_workers)
+        self.max_queued = int(max_queued)
+        self.history = int(history)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hydronet-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Run ``fn(job, *args, **kwargs)`` in the background, once per ``key``.
+
+        Returns the existing job when ``key`` is queued, running or finished
+        and still remembered; failed and cancelled jobs are started afresh.
+        Raises :class:`JobQueueFull` when ``max_queued`` jobs are waiting.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.status not in (FAILED, CANCELLED):
+                self._jobs.move_to_end(key)
+                return job
+            queued = sum(j.status == PENDING for j in self._jobs.values())
+            if queued >= self.max_queued:
+                raise JobQueueFull(f"{queued} jobs are already waiting for a worker")
+            job = Job(key)
+            self._jobs[key] = job
+            self._evict()
+            job._future = self._pool.submit(self._run, job, fn, args, kwargs)
+            return job
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def discard(self, key):
+        """Forget ``key`` if its job has finished, so the next submit reruns it.
+
+        For jobs that store their result elsewhere (a cache) that has since
+        dropped it; queued and running jobs are kept.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.done:
+                del self._jobs[key]
+
+    def active(self):
+        """Jobs still queued or running."""
+        with self._lock:
+            return [job for job in self._jobs.values() if not job.done]
+
+    def shutdown(self, cancel=True):
+        if cancel:
+            for job in self.active():
+                job.cancel()
+        self._pool.shutdown(wait=True)
+
+    def _evict(self):
+        # Caller holds the lock; only finished jobs are forgotten
+        finished = [key for key, job in self._jobs.items() if job.done]
+        for key in finished[:max(0, len(self._jobs) - self.history)]:
+            del self._jobs[key]
+
+    @staticmethod
+    def _run(job, fn, args, kwargs):
+        if job.cancelled:
+            job._finish(CANCELLED)
+            return
+        with job._lock:
+            job.status = RUNNING
+            job.started = time.time()
+        try:
+            result = fn(job, *args, **kwargs)
+        except JobCancelled:
+            job._finish(CANCELLED)
+        except Exception as exc:    # surfaced to every viewer through the snapshot
+            job._finish(FAILED, error=f"{type(exc).__name__}: {exc}")
+        else:
+            job._finish(DONE, result=result)
+
+
+def storm_job(job, intensity, n_cells=400, length=15.0, params=ModelParams(), dt=0.025,
+              publish_every=None):
+    """Run one storm as a job, publishing ``t``, ``x`` and the ``C`` profile.
+
+    ``publish_every`` steps between updates defaults to about fifty updates
+    per storm. Returns ``{"x": x, "state": state}`` like ``simulate_storm``.
+    """
+    storm = StormEvent(intensity=float(intensity))
+    solver = CUSIRSolver(n_cells=n_cells, length=length, params=params, dt=dt)
+    n_steps = int(round(storm.duration / dt))
+    every = publish_every or max(1, n_steps // 50)
+    steps = 0
+
+    def on_step(t, state):
+        nonlocal steps
+        steps += 1
+        if steps % every == 0 or steps == n_steps:
+            job.publish(steps / n_steps, t=t, x=solver.x, C=state[C, 0])
+
+    state = solver.run(storm, callback=on_step)
+    return {"x": solver.x, "state": state[:, 0].copy()}
@@ -0,0 +1,113 @@
+"""Resized, compressed image variants served from a content-hashed cache.
+
+``MediaCache.image(path, width)`` returns the path of a variant of ``path``
+no wider than ``width`` pixels, encoded as WebP (or JPEG/PNG when the local
+Pillow build lacks WebP). Variants are named after a hash of the source
+bytes, so they are generated once, survive restarts and are never stale.
+Generation is lazy; :meth:`MediaCache.pregenerate` (or ``python -m
+hydronet.media``) fills the cache ahead of time at build or startup.
+
+Pillow is optional: without it every call returns the original file.
+"""
+import base64
+import hashlib
+import mimetypes
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+try:
+    from PIL import Image, features
+except ImportError:     # pragma: no cover - exercised only without Pillow
+    Image = None
+
+DEFAULT_WIDTHS = (240, 960, 1600)
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+class MediaCache:
+    def __init__(self, root=".cache/media", quality=80):
+        self.root = Path(root)
+        self.quality = int(quality)
+        self.webp = Image is not None and features.check("webp")
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+    def content_hash(self, path):
+        """Hash of the file bytes, memoized on (path, size, mtime)."""
+        path = Path(path)
+        st = path.stat()
+        key = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+        digest = self._hashes.get(key)
+        if digest is None:
+            h = hashlib.sha256()
+            with open(path, "rb") as fh:
+                for block in iter(lambda: fh.read(1 << 20), b""):
+                    h.update(block)
+            digest = self._hashes[key] = h.hexdigest()[:16]
+        return digest
+
+    def _suffix(self, source):
+        if self.webp:
+            return ".webp"
+        return ".png" if source.suffix.lower() == ".png" else ".jpg"
+
+    def image(self, path, width=960):
+        """Path (as ``str``) of the cached variant, generating it if needed."""
+        source = Path(path)
+        if Image is None or source.suffix.lower() not in IMAGE_SUFFIXES:
+            return str(source)
+        target = self.root / f"{source.stem.replace(' ', '_')}-{self.content_hash(source)}-w{int(width)}{self._suffix(source)}"
+        if not target.exists():
+            with self._lock:
+                if not target.exists():
+                    self._encode(source, target, int(width))
+        return str(target)
+
+    def _encode(self, source, target, width):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with Image.open(source) as img:
+            img.load()
+            if img.width > width:
+                img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+            suffix = target.suffix
+            if suffix == ".jpg" and img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            options = {"quality": self.quality}
+            if suffix == ".webp":
+                options["method"] = 6
+            elif suffix == ".jpg":
+                options.update(optimize=True, progressive=True)
+            else:
+                options = {"optimize": True}
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=suffix)
+            os.close(fd)
+            try:
+                img.save(tmp, format={".webp": "WEBP", ".jpg": "JPEG", ".png": "PNG"}[suffix], **options)
+                os.replace(tmp, target)
+            finally:
+                Path(tmp).unlink(missing_ok=True)
+
+    def data_uri(self, path, width=240):
+        """``data:`` URI of a small variant, for images embedded in raw HTML."""
+        variant = Path(self.image(path, width))
+        mime = mimetypes.guess_type(variant.name)[0] or "application/octet-stream"
+        return f"data:{mime};base64,{base64.b64encode(variant.read_bytes()).decode()}"
+
+    def pregenerate(self, paths, widths=DEFAULT_WIDTHS):
+        """Build every variant of ``paths`` up front; returns the variant paths."""
+        return [self.image(p, w) for p in paths for w in widths]
+
+
+def main(argv=None):
+    paths = (argv if argv is not None else sys.argv[1:]) or sorted(
+        str(p) for p in Path(".").iterdir() if p.suffix.lower() in IMAGE_SUFFIXES
+    )
+    for variant in MediaCache().pregenerate(paths):
+        print(variant)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Filter placement search over a pipe network.
+
+A placement is a set of nodes fitted with a HydroNet cartridge. As in
+:mod:`hydronet.clog`, a cartridge treats flow up to its design rate and the
+excess bypasses, so it removes a fraction ``efficiency`` of the treated share
+``capture = min(1, q_design / q_node)`` of the load passing through. It is
+scored with the steady transport model of :meth:`PipeNetwork.transfer_matrix`:
+node outflow loads solve
+
+    M = E (w + A^T M),    E = diag(1 - efficiency * capture * placed)
+
+and the score is the total load leaving the outfalls. Candidate scoring runs
+in a ``concurrent.futures`` process pool. The triangular transfer system and
+the runoff loads live in ``multiprocessing.shared_memory`` blocks that each
+worker maps once at start-up, so tasks only carry node-index arrays.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import spsolve_triangular
+
+from hydronet.clog import CartridgeSpec
+from hydronet.solver import ModelParams
+
+# Worker-side view of the shared problem, set by _attach()
+_WORKER = {}
+
+
+class TransferSystem:
+    """``(I - E A^T) M = E w`` in upstream-first node order.
+
+    In topological order ``A^T`` is strictly lower triangular, so each
+    placement costs one row scaling and one sparse triangular solve with no
+    factorization. Arrays are plain buffers so they can live in shared memory.
+    """
+
+    def __init__(self, indptr, indices, data, rows, w, capture, position, outfalls):
+        self.indptr, self.indices, self.data, self.rows = indptr, indices, data, rows
+        self.w, self.capture, self.position, self.outfalls = w, capture, position, outfalls
+        self.n = w.size
+
+    @classmethod
+    def build(cls, network, intensity=30.0, params=ModelParams(),
+              design_flow=CartridgeSpec.design_flow):
+        order = network.topological_order()
+        position = np.empty_like(order)
+        position[order] = np.arange(order.size)
+        AT = network.transfer_matrix(intensity, params).T.tocsr()
+        AT = AT[order][:, order].tocsr()
+        AT.sort_indices()
+        rows = np.repeat(np.arange(AT.shape[0]), np.diff(AT.indptr))
+        # Share of each node's throughflow a cartridge treats; the rest bypasses
+        flow = network.node_flows(intensity)[order]
+        capture = np.minimum(1.0, design_flow / np.maximum(flow, 1e-12))
+        return cls(AT.indptr, AT.indices, AT.data, rows,
+                   network.runoff_load(intensity)[order], capture, position,
+                   position[network.outfalls])
+
+    def arrays(self):
+        return {"indptr": self.indptr, "indices": self.indices, "data": self.data,
+                "rows": self.rows, "w": self.w, "capture": self.capture, "position": self.position,
+                "outfalls": self.outfalls}
+
+    def loads(self, placed=(), efficiency=0.8):
+        """Outflow load of every node (in topological order) for a placement."""
+        keep = np.ones(self.n)
+        at = self.position[np.asarray(placed, dtype=np.int64)]
+        keep[at] -= efficiency * self.capture[at]
+        M = sparse.csr_matrix((-self.data * keep[self.rows], self.indices, self.indptr),
+                              shape=(self.n, self.n))
+        return spsolve_triangular(M, keep * self.w, lower=True, unit_diagonal=True)
+
+    def outfall_load(self, placed=(), efficiency=0.8):
+        return float(self.loads(placed, efficiency)[self.outfalls].sum())
+
+
+def _share(arrays):
+    blocks, spec = [], {}
+    for name, array in arrays.items():
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, array.dtype, buffer=shm.buf)[...] = array
+        blocks.append(shm)
+        spec[name] = (shm.name, array.shape, array.dtype.str)
+    return blocks, spec
+
+
+def _attach(spec, efficiency):
+    arrays, blocks = {}, []
+    for name, (shm_name, shape, dtype) in spec.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        blocks.append(shm)
+        arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf)
+    _WORKER.update(blocks=blocks, system=TransferSystem(**arrays), efficiency=efficiency)
+
+
+def _score_batch(placements):
+    system, efficiency = _WORKER["system"], _WORKER["efficiency"]
+    return [system.outfall_load(p, efficiency) for p in placements]
+
+
+def _score_additions(base, candidates):
+    base = np.asarray(base, dtype=np.int64)
+    return _score_batch([np.append(base, c) for c in candidates])
+
+
+def _anneal_chain(start, candidates, iterations, temperature, seed):
+    rng = np.random.default_rng(seed)
+    current = np.array(start, dtype=np.int64)
+    current_score = _score_batch([current])[0]
+    best, best_score = current.copy(), current_score
+    t0 = temperature * max(current_score, 1e-12)
+    for it in range(iterations):
+        free = np.setdiff1d(candidates, current, assume_unique=True)
+        if not free.size:
+            break
+        trial = current.copy()
+        trial[rng.integers(trial.size)] = free[rng.integers(free.size)]
+        score = _score_batch([trial])[0]
+        temp = t0 * (1.0 - it / iterations) + 1e-12
+        if score < current_score or rng.random() < math.exp((current_score - score) / temp):
+            current, current_score = trial, score
+            if score < best_score:
+                best, best_score = trial.copy(), score
+    return best, best_score
+
+
+class PlacementOptimizer:
+    """Greedy and simulated-annealing placement search on a process pool.
+
+    Use as a context manager; leaving it shuts the pool down and releases
+    the shared-memory blocks.
+    """
+
+    def __init__(self, network, intensity=30.0, params=ModelParams(), efficiency=0.8,
+                 design_flow=CartridgeSpec.design_flow, max_workers=None):
+        self.network = network
+        self.efficiency = float(efficiency)
+        self.system = TransferSystem.build(network, intensity, params, design_flow)
+        self._blocks, spec = _share(self.system.arrays())
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_attach,
+            initargs=(spec, self.efficiency),
+        )
+
+    def close(self):
+        self._pool.shutdown()
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def score(self, placement):
+        """Outfall load for one placement, evaluated in-process."""
+        return self.system.outfall_load(placement, self.efficiency)
+
+    def throughput(self):
+        """Load passing each node with no filters installed."""
+        return self.system.loads()[self.system.position]
+
+    def removable(self):
+        """Load a single filter at each node would intercept (treated share only)."""
+        return self.throughput() * self.system.capture[self.system.position]
+
+    def shortlist(self, n_candidates):
+        """Nodes where one filter intercepts the most load, most first."""
+        load = self.removable()
+        n_candidates = min(int(n_candidates), load.size)
+        top = np.argpartition(-load, n_candidates - 1)[:n_candidates]
+        return top[np.argsort(-load[top])]
+
+    def _chunks(self, items):
+        n = max(1, math.ceil(len(items) / (4 * self.max_workers)))
+        return [items[i:i + n] for i in range(0, len(items), n)]
+
+    def score_many(self, placements):
+        """Score many placements across the pool, preserving order."""
+        placements = [np.asarray(p, dtype=np.int64) for p in placements]
+        futures = [self._pool.submit(_score_batch, chunk) for chunk in self._chunks(placements)]
+        return np.array([s for f in futures for s in f.result()])
+
+    def greedy(self, budget, candidates=None, n_candidates=500):
+        """Add the filter with the largest load reduction, ``budget`` times.
+
+        Each round scores every remaining candidate in parallel. Returns the
+        placement in order of selection and the score after each addition.
+        """
+        candidates = self.shortlist(n_candidates) if candidates is None else np.asarray(candidates)
+        placed, history = [], []
+        remaining = list(candidates)
+        for _ in range(min(int(budget), len(remaining))):
+            futures = [self._pool.submit(_score_additions, placed, chunk)
+                       for chunk in self._chunks(remaining)]
+            scores = np.array([s for f in futures for s in f.result()])
+            best = int(np.argmin(scores))
+            placed.append(int(remaining.pop(best)))
+            history.append(float(scores[best]))
+        return np.array(placed, dtype=np.int64), np.array(history)
+
+    def anneal(self, budget, candidates=None, n_candidates=500, iterations=500,
+               n_chains=None, temperature=0.05, seed=0, start=None):
+        """Independent swap-move annealing chains, one per worker.
+
+        Chains start from ``start`` (default: the first ``budget``
+        candidates, which for a shortlist are the nodes with the most
+        removable load) and the best placement found by any chain is
+        returned with its score.
+        """
+        candidates = self.shortlist(n_candidates) if candidates is None else np.asarray(candidates)
+        start = candidates[:int(budget)] if start is None else np.asarray(start)
+        n_chains = n_chains or self.max_workers
+        futures = [self._pool.submit(_anneal_chain, start, candidates, int(iterations),
+                                     float(temperature), seed + k)
+                   for k in range(n_chains)]
+        results = [f.result() for f in futures]
+        best, score = min(results, key=lambda r: r[1])
+        return best, score
@@ -0,0 +1,120 @@
+"""Per-section timing, allocation and payload statistics for the dashboard.
+
+:meth:`Profiler.section` wraps a block and records its wall time; with
+allocation tracing on it also records the bytes the block left allocated
+and its peak traced memory (``tracemalloc``). Callers can attach extra
+metrics, such as the size of a payload sent to the browser, to the sample
+the context manager yields. Each metric keeps a bounded window of recent
+samples so percentiles reflect current behaviour.
+
+``tracemalloc`` is process-wide: while it is on every thread pays its
+overhead, and concurrent sessions show up in each other's allocation
+numbers. Wall times are cheap and always recorded.
+"""
+import cProfile
+import marshal
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class Profiler:
+    """Rolling per-section metrics, shared by every session of the app."""
+
+    def __init__(self, window=200):
+        self.window = int(window)
+        self._samples = defaultdict(lambda: defaultdict(lambda: deque(maxlen=self.window)))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def trace_memory(self):
+        return tracemalloc.is_tracing()
+
+    @trace_memory.setter
+    def trace_memory(self, on):
+        if on and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not on and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def record(self, name, **metrics):
+        """Add one sample of ``metrics`` to section ``name``."""
+        with self._lock:
+            section = self._samples[name]
+            for metric, value in metrics.items():
+                section[metric].append(float(value))
+
+    @contextmanager
+    def section(self, name):
+        """Time the enclosed block; yields a dict for extra metrics."""
+        sample = {}
+        # Open sections of this thread as [base bytes, peak seen so far]
+        stack = self._local.__dict__.setdefault("stack", [])
+        frame = None
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # The peak is about to be reset; enclosing sections keep theirs
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            frame = [current, current]
+            stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield sample
+        finally:
+            sample["wall_ms"] = 1e3 * (time.perf_counter() - start)
+            if frame is not None:
+                stack.pop()
+                if tracemalloc.is_tracing():
+                    now, peak = tracemalloc.get_traced_memory()
+                    peak = max(peak, frame[1])
+                    sample["alloc_kb"] = (now - frame[0]) / 1024
+                    sample["peak_kb"] = (peak - frame[0]) / 1024
+                    if stack:
+                        stack[-1][1] = max(stack[-1][1], peak)
+            self.record(name, **sample)
+
+    def summary(self, percentiles=(50, 95)):
+        """``{section: {"count": n, "<metric>_p50": ...}}`` over the window."""
+        with self._lock:
+            snapshot = {name: {m: np.array(v) for m, v in metrics.items()}
+                        for name, metrics in self._samples.items()}
+        out = {}
+        for name, metrics in sorted(snapshot.items()):
+            row = {"count": max(v.size for v in metrics.values())}
+            for metric, values in metrics.items():
+                for p, value in zip(percentiles, np.percentile(values, percentiles)):
+                    row[f"{metric}_p{p}"] = float(value)
+            out[name] = row
+        return out
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+def start_capture():
+    """Begin a cProfile capture of the calling thread.
+
+    Returns ``None`` when another profiler is already active; from Python
+    3.12 only one can run at a time in a process.
+    """
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        return None
+    return profile
+
+
+def finish_capture(profile):
+    """Stop ``profile``; returns bytes in the ``pstats`` dump format."""
+    profile.disable()
+    profile.create_stats()
+    return marshal.dumps(profile.stats)
@@ -0,0 +1,368 @@
+"""Append-only columnar store for historical node telemetry.
+
+Readings are partitioned by node and UTC day and written as immutable
+segments, one raw ``.npy`` file per column::
+
+    root/node=000042/day=2026-10-17/seg-000003-1792224000-1792227599/t.npy
+                                                                  /pressure.npy
+                                                                  /...
+
+Rows inside a segment are sorted by time and the segment's time span is part
+of its directory name, so a query prunes partitions by path and segments by
+name before opening anything. A compacted segment's name also carries the
+range of sequence numbers it replaces (``seg-000012-...-r000001-000011``):
+it appears with one rename, readers ignore the segments it covers from then
+on, and those are deleted afterwards or by a later compaction. Columns are opened with ``mmap_mode="r"`` and
+sliced with ``searchsorted``, so reads are zero-copy and only touch the pages
+they return.
+"""
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from hydronet.telemetry import CHANNELS, READING_DTYPE
+
+DAY = 86_400
+_SEGMENT = re.compile(r"seg-(\d+)-(-?\d+)-(-?\d+)(?:-r(\d+)-(\d+))?$")
+
+
+def _day_name(day):
+    return "day=" + datetime.fromtimestamp(int(day) * DAY, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _day_index(name):
+    date = datetime.strptime(name[len("day="):], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    return int(date.timestamp()) // DAY
+
+
+def _node_name(node):
+    return f"node={int(node):06d}"
+
+
+def _repeats(t):
+    """Mask of rows whose (sorted) timestamp equals the previous row's."""
+    repeat = np.zeros(len(t), dtype=bool)
+    repeat[1:] = t[1:] == t[:-1]
+    return repeat
+
+
+def _unique_times(rows):
+    repeat = _repeats(rows["t"])
+    return rows[~repeat] if repeat.any() else rows
+
+
+class TimeSeriesStore:
+    """Reader and segment writer over a store directory."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    # --- writing ---
+
+    def append(self, readings):
+        """Write ``readings`` (a READING_DTYPE array) as new segments.
+
+        One segment is created per (node, day) present, so callers should
+        batch readings (see :class:`StoreWriter`) rather than append per tick.
+        """
+        readings = np.asarray(readings, dtype=READING_DTYPE)
+        if not readings.size:
+            return 0
+        day = np.floor(readings["t"] / DAY).astype(np.int64)
+        order = np.lexsort((readings["t"], day, readings["node"]))
+        readings, day = readings[order], day[order]
+        key_change = (np.diff(readings["node"]) != 0) | (np.diff(day) != 0)
+        bounds = np.concatenate(([0], np.flatnonzero(key_change) + 1, [readings.size]))
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            self._write_segment(int(readings["node"][lo]), int(day[lo]), readings[lo:hi])
+        return len(bounds) - 1
+
+    def _write_segment(self, node, day, rows, replaces=None):
+        partition = self.root / _node_name(node) / _day_name(day)
+        partition.mkdir(parents=True, exist_ok=True)
+        t = rows["t"]
+        with self._lock:
+            seq = 1 + max((int(m.group(1)) for m in map(_SEGMENT.match, os.listdir(partition)) if m),
+                          default=0)
+            name = f"seg-{seq:06d}-{int(np.floor(t[0]))}-{int(np.ceil(t[-1]))}"
+            if replaces is not None:
+                name += "-r{:06d}-{:06d}".format(*replaces)
+            # Build in a hidden temp dir and rename, so readers never see a
+            # half-written segment
+            tmp = partition / f".tmp-{uuid.uuid4().hex}"
+            tmp.mkdir()
+            np.save(tmp / "t.npy", np.ascontiguousarray(t))
+            for column in CHANNELS:
+                np.save(tmp / f"{column}.npy", np.ascontiguousarray(rows[column]))
+            tmp.rename(partition / name)
+
+    def compact(self, node, day):
+        """Merge all segments of one partition into a single segment.
+
+        Rows repeating a timestamp keep only the first (oldest) copy.
+        """
+        partition = self.root / _node_name(node) / _day_name(day)
+        segments, replaced = self._listing(partition)
+        if len(segments) >= 2:
+            rows = np.concatenate([self._read_segment(path) for path, _, _ in segments])
+            rows = _unique_times(rows[np.argsort(rows["t"], kind="stable")])
+            covered = [_SEGMENT.match(path.name) for path, _, _ in segments]
+            first = min(int(m.group(4) or m.group(1)) for m in covered)
+            last = max(int(m.group(1)) for m in covered)
+            # The rename inside _write_segment is the switch-over for readers
+            self._write_segment(node, day, rows, replaces=(first, last))
+            replaced += [path for path, _, _ in segments]
+        for path in replaced:
+            shutil.rmtree(path, ignore_errors=True)
+
+    # --- reading ---
+
+    def nodes(self):
+        return sorted(int(p.name[len("node="):]) for p in self.root.glob("node=*"))
+
+    def days(self, node):
+        """Day indices (epoch days) with data for ``node``."""
+        return sorted(_day_index(p.name) for p in (self.root / _node_name(node)).glob("day=*"))
+
+    def segments(self, node, day):
+        """``(path, t_lo, t_hi)`` of each segment in one partition, by start time."""
+        return self._segments(self.root / _node_name(node) / _day_name(day))
+
+    def _segments(self, partition):
+        return self._listing(partition)[0]
+
+    def _listing(self, partition):
+        # Live segments by start time, and paths replaced by a compaction
+        found, covered = [], []
+        if partition.is_dir():
+            for name in os.listdir(partition):
+                m = _SEGMENT.match(name)
+                if m:
+                    found.append((int(m.group(1)), partition / name, int(m.group(2)), int(m.group(3))))
+                    if m.group(4):
+                        covered.append((int(m.group(4)), int(m.group(5))))
+        live, replaced = [], []
+        for seq, path, t_lo, t_hi in found:
+            if any(lo <= seq <= hi for lo, hi in covered):
+                replaced.append(path)
+            else:
+                live.append((path, t_lo, t_hi))
+        live.sort(key=lambda s: s[1])
+        return live, replaced
+
+    def _read_segment(self, path):
+        t = np.load(path / "t.npy")
+        rows = np.empty(t.size, dtype=READING_DTYPE)
+        rows["t"] = t
+        rows["node"] = int(path.parent.parent.name[len("node="):])
+        for column in CHANNELS:
+            rows[column] = np.load(path / f"{column}.npy")
+        return rows
+
+    def _partitions(self, node, start, end):
+        node_dir = self.root / _node_name(node)
+        if start is not None and end is not None:
+            # Derive partition paths from the range instead of listing them
+            days = range(int(start // DAY), int(end // DAY) + 1)
+            return [node_dir / _day_name(d) for d in days]
+        if not node_dir.is_dir():
+            return []
+        days = sorted(_day_index(p.name) for p in node_dir.glob("day=*"))
+        return [node_dir / _day_name(d) for d in days
+                if (start is None or d >= start // DAY) and (end is None or d <= end // DAY)]
+
+    def scan(self, nodes=None, start=None, end=None, columns=CHANNELS):
+        """Yield ``(node, {"t": ..., column: ...})`` memory-mapped slices.
+
+        ``start``/``end`` are epoch seconds (inclusive); slices are views of
+        the mapped files and cover only rows inside the range.
+        """
+        nodes = self.nodes() if nodes is None else nodes
+        for node in nodes:
+            for partition in self._partitions(node, start, end):
+                for out in self._map_partition(partition, start, end, columns):
+                    yield int(node), out
+
+    def _map_partition(self, partition, start, end, columns, retries=3):
+        # Map every segment before yielding any: if a compaction deletes a
+        # listed segment first, list the partition again
+        for attempt in range(retries + 1):
+            try:
+                mapped = []
+                for path, t_lo, t_hi in self._segments(partition):
+                    if (start is not None and t_hi < start) or (end is not None and t_lo > end):
+                        continue
+                    out = self._map_segment(path, start, end, columns)
+                    if out is not None:
+                        mapped.append(out)
+                return mapped
+            except FileNotFoundError:
+                if attempt == retries:
+                    raise
+
+    @staticmethod
+    def _map_segment(path, start, end, columns):
+        t = np.load(path / "t.npy", mmap_mode="r")
+        lo = 0 if start is None else int(np.searchsorted(t, start, side="left"))
+        hi = t.size if end is None else int(np.searchsorted(t, end, side="right"))
+        if hi <= lo:
+            return None
+        out = {"t": t[lo:hi]}
+        for column in columns:
+            out[column] = np.load(path / f"{column}.npy", mmap_mode="r")[lo:hi]
+        return out
+
+    def query(self, nodes=None, start=None, end=None, columns=CHANNELS):
+        """Return ``{node: {"t": array, column: array}}`` for the range.
+
+        Single-segment results stay zero-copy views; multi-segment results
+        are concatenated (copying only the selected rows) and, where segment
+        spans overlap (late or replayed readings), merged into time order.
+        Rows repeating a timestamp keep only the first (oldest) copy.
+        """
+        parts = {}
+        for node, cols in self.scan(nodes, start, end, columns):
+            parts.setdefault(node, []).append(cols)
+        result = {}
+        for node, chunks in parts.items():
+            if len(chunks) == 1:
+                merged = chunks[0]
+            else:
+                merged = {name: np.concatenate([c[name] for c in chunks]) for name in chunks[0]}
+                if np.any(np.diff(merged["t"]) < 0):
+                    order = np.argsort(merged["t"], kind="stable")
+                    merged = {name: values[order] for name, values in merged.items()}
+            repeat = _repeats(merged["t"])
+            if repeat.any():
+                merged = {name: values[~repeat] for name, values in merged.items()}
+            result[node] = merged
+        return result
+
+
+class StoreWriter:
+    """Buffers incoming chunks per (node, day) and flushes them as large segments.
+
+    A partition's buffer is flushed when it reaches ``segment_rows``, when
+    it has waited ``max_age`` seconds, when a later day arrives for its node
+    (the day has closed) or, largest first, when all buffers together exceed
+    ``max_pending_rows``. A partition with more than ``max_segments`` segments
+    after a flush, or whose day has closed, is compacted, so a closed day
+    ends up as one segment however many nodes report.
+
+    Usable as the ``sink`` of a :class:`hydronet.telemetry.TelemetryFeed`.
+    Call :meth:`close` (or use it as a context manager) to write the tail.
+    """
+
+    def __init__(self, store, segment_rows=86_400, max_pending_rows=2_000_000, max_age=600.0,
+                 max_segments=16, clock=time.monotonic):
+        self.store = store
+        self.segment_rows = int(segment_rows)
+        self.max_pending_rows = int(max_pending_rows)
+        self.max_age = float(max_age)
+        self.max_segments = int(max_segments)
+        self.clock = clock
+        self._pending = {}          # (node, day) -> [chunks]
+        self._rows = {}             # (node, day) -> buffered rows
+        self._since = {}            # (node, day) -> clock() of the oldest buffered chunk
+        self._latest_day = {}       # node -> latest day seen
+        self._days = {}             # node -> days with buffered rows
+        self._total = 0
+
+    @property
+    def pending_rows(self):
+        return self._total
+
+    def write(self, chunk):
+        chunk = np.asarray(chunk, dtype=READING_DTYPE)
+        if not chunk.size:
+            return
+        now = self.clock()
+        day = np.floor(chunk["t"] / DAY).astype(np.int64)
+        order = np.lexsort((day, chunk["node"]))
+        chunk, day = chunk[order], day[order]
+        key_change = (np.diff(chunk["node"]) != 0) | (np.diff(day) != 0)
+        bounds = np.concatenate(([0], np.flatnonzero(key_change) + 1, [chunk.size]))
+        full, closed = [], []
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            key = (int(chunk["node"][lo]), int(day[lo]))
+            self._pending.setdefault(key, []).append(chunk[lo:hi])
+            self._days.setdefault(key[0], set()).add(key[1])
+            self._rows[key] = self._rows.get(key, 0) + int(hi - lo)
+            self._since.setdefault(key, now)
+            self._total += int(hi - lo)
+            if self._rows[key] >= self.segment_rows:
+                full.append(key)
+            node, d = key
+            previous = self._latest_day.get(node)
+            if previous is None or d > previous:
+                self._latest_day[node] = d
+                if previous is not None:
+                    # The previous day may already be fully flushed; compact it anyway
+                    closed.append((node, previous))
+                    closed.extend((node, k) for k in self._days[node] if k < d)
+        for key in full:
+            self._flush(key)
+        for key in dict.fromkeys(closed):
+            self._flush(key)
+            self._compact(key)
+        if self._total > self.max_pending_rows:
+            for key in sorted(self._rows, key=self._rows.get, reverse=True):
+                self._flush(key)
+                if self._total <= self.max_pending_rows // 2:
+                    break
+        stale = [key for key, since in self._since.items() if now - since >= self.max_age]
+        for key in stale:
+            self._flush(key)
+
+    def _flush(self, key):
+        chunks = self._pending.pop(key, None)
+        if not chunks:
+            return
+        rows = self._rows.pop(key)
+        self._total -= rows
+        del self._since[key]
+        days = self._days[key[0]]
+        days.discard(key[1])
+        if not days:
+            del self._days[key[0]]
+        # Fill one array; concatenating many structured chunks is slow
+        merged = np.empty(rows, dtype=READING_DTYPE)
+        at = 0
+        for part in chunks:
+            merged[at:at + part.size] = part
+            at += part.size
+        self.store.append(merged)
+        if len(self.store.segments(*key)) > self.max_segments:
+            self.store.compact(*key)
+
+    def _compact(self, key):
+        # Also clears segments a crashed compaction left behind
+        self.store.compact(*key)
+
+    def flush(self):
+        """Write every buffered partition."""
+        for key in list(self._pending):
+            self._flush(key)
+
+    def close(self):
+        """Flush everything and compact each partition of a closed day."""
+        self.flush()
+        for node, latest in self._latest_day.items():
+            for day in self.store.days(node):
+                if day < latest:
+                    self._compact((node, day))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,373 @@
+"""Physics-informed neural surrogate of the contaminant field C(x, t).
+
+A small tanh MLP maps (discharge intensity, source scale, time) to the
+coefficients of a POD basis of C / (intensity * source_scale) on the solver
+grid, so a query over any number of settings is three batched matrix
+products and one decode product. Training runs offline on CPU against
+finite-difference solutions from :class:`CUSIRSolver`:
+
+* the data loss fits the solver's snapshots in basis coordinates;
+* the physics loss penalises the residual of one solver step of the C
+  equation applied to the decoded field,
+
+      (1 + dt delta) T C(t + dt) - P C(t) - dt d1 P I(t) - dt S(x, t) = 0,
+
+  where P interpolates along the departure points of U and T is the
+  implicit diffusion matrix (a discrete-time PINN, Raissi et al. 2019,
+  with the coupled fields as known coefficients). This is the solver's
+  own scheme, so the residual vanishes on its trajectories; the
+  continuous PDE residual does not, and penalising it pulled the fit away
+  from the solver. It is evaluated at collocation settings midway between
+  the training settings, where there is no data: U and I there come from
+  a solver run whose C is never shown to the network.
+
+Weights are plain arrays in one ``.npz``; :meth:`Surrogate.load` needs only
+NumPy. Trained weights are an artifact, not source: build them with
+``python -m hydronet train-surrogate`` and verify them with
+``python -m hydronet check-surrogate``.
+"""
+import time
+from dataclasses import astuple, dataclass
+
+import numpy as np
+
+from hydronet.solver import C, I, U, CUSIRSolver, ModelParams, StormEvent
+
+
+@dataclass(frozen=True)
+class SurrogateSpec:
+    intensity_range: tuple = (5.0, 100.0)
+    source_range: tuple = (0.25, 4.0)
+    n_intensity: int = 32
+    n_source: int = 4           # C is nearly linear in the source, so few are needed
+    n_cells: int = 400
+    length: float = 15.0
+    dt: float = 0.025
+    snapshots: int = 25         # training times per storm, t_start to the storm's end
+    t_start: float = 0.1        # hours; starts before t_min so that edge is interior
+    t_min: float = 0.25         # earliest time served; before it the plume is still forming
+    hidden: int = 64
+    n_basis: int = 24
+    n_fourier: int = 8          # sin/cos pairs of the travel distance
+    iterations: int = 8000
+    learning_rate: float = 3e-3
+    physics_weight: float = 2e-4   # larger weights trade data fit for step consistency
+    physics_batch: int = 256    # collocation rows per step for the residual
+    early_weight: float = 10.0  # largest data-loss weight of a low-norm snapshot
+    seed: int = 0
+
+
+def _encode(lo, hi, value):
+    # Log-scaled to [-1, 1]
+    lo, hi = np.log(lo), np.log(hi)
+    return 2.0 * (np.log(value) - lo) / (hi - lo) - 1.0
+
+
+def _sample_grid(spec):
+    q = np.geomspace(*spec.intensity_range, spec.n_intensity)
+    s = np.geomspace(*spec.source_range, spec.n_source)
+    return np.repeat(q, s.size), np.tile(s, q.size)
+
+
+def _collocation_grid(spec):
+    # Geometric midpoints of the training grid, so no setting has data
+    q = np.geomspace(*spec.intensity_range, spec.n_intensity)
+    s = np.geomspace(*spec.source_range, spec.n_source)
+    q, s = np.sqrt(q[1:] * q[:-1]), np.sqrt(s[1:] * s[:-1])
+    return np.repeat(q, s.size), np.tile(s, q.size)
+
+
+def solver_snapshots(intensity, source_scale, spec=SurrogateSpec(), params=ModelParams(),
+                     storm=StormEvent()):
+    """One batched solver run over all settings, sampled ``spec.snapshots`` times.
+
+    Samples are evenly spaced solver steps from ``spec.t_start`` to the end
+    of the storm.
+
+    Returns a dict of ``t`` (snapshots,) and ``C``, ``U``, ``I`` shaped
+    ``(members, snapshots, n_cells)``.
+    """
+    intensity = np.asarray(intensity, dtype=float).ravel()
+    source_scale = np.broadcast_to(np.asarray(source_scale, dtype=float), intensity.shape)
+    solver = CUSIRSolver(n_cells=spec.n_cells, length=spec.length, params=params, dt=spec.dt,
+                         batch=intensity.size)
+    n_steps = int(round(storm.duration / spec.dt))
+    first = max(1, int(round(spec.t_start / spec.dt)))
+    take = set(np.linspace(first, n_steps, spec.snapshots).round().astype(int).tolist())
+    times, fields = [], []
+    step = 0
+
+    def record(t, state):
+        nonlocal step
+        step += 1
+        if step in take:
+            times.append(t)
+            fields.append(state[[C, U, I]].copy())
+
+    solver.run(storm, callback=record, intensity=intensity, source_scale=source_scale)
+    stacked = np.stack(fields, axis=2)          # (3, members, snapshots, n)
+    return {"t": np.array(times), "C": stacked[0], "U": stacked[1], "I": stacked[2], "x": solver.x}
+
+
+def _departures(U, dt, dx):
+    # Interpolation cells and weights of CUSIRSolver._advect, per row
+    n = U.shape[1]
+    pos = np.clip(np.arange(n) - U * dt / dx, 0.0, n - 1)
+    i0 = np.minimum(np.floor(pos).astype(np.intp), n - 2)
+    return i0, pos - i0
+
+
+def _interpolate(F, i0, w):
+    rows = np.arange(F.shape[0])[:, None]
+    return F[rows, i0] * (1.0 - w) + F[rows, i0 + 1] * w
+
+
+def _interpolate_adjoint(G, i0, w):
+    flat = (np.arange(G.shape[0]) * G.shape[1])[:, None] + i0
+    out = np.bincount(flat.ravel(), weights=(G * (1.0 - w)).ravel(), minlength=G.size)
+    out += np.bincount((flat + 1).ravel(), weights=(G * w).ravel(), minlength=G.size)
+    return out.reshape(G.shape)
+
+
+def _d2dx2(F, dx):
+    # Zero-flux second difference; symmetric, so it is its own adjoint
+    out = np.empty_like(F)
+    out[:, 1:-1] = F[:, 2:] - 2.0 * F[:, 1:-1] + F[:, :-2]
+    out[:, 0] = F[:, 1] - F[:, 0]
+    out[:, -1] = F[:, -2] - F[:, -1]
+    return out / dx ** 2
+
+
+class Surrogate:
+    """Trained MLP plus POD decoder; all queries are batched matrix products.
+
+    The network predicts the shape C / (intensity * source_scale), which
+    varies far less across settings than C itself; :meth:`predict` scales
+    it back.
+    """
+
+    def __init__(self, weights):
+        self.weights = {name: np.asarray(value) for name, value in weights.items()}
+        w = self.weights
+        self.layers = [(w[f"W{k}"], w[f"b{k}"]) for k in range(int(w["n_layers"]))]
+        self.x = w["x"]
+        self.duration = float(w["duration"])
+        # Earliest time the surrogate is trained and checked for
+        self.t_min = float(w["t_min"])
+        self.intensity_range = tuple(w["intensity_range"].tolist())
+        self.source_range = tuple(w["source_range"].tolist())
+        self.travel_max = float(w["velocity_per_unit"]) * self.intensity_range[1] * self.duration
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def save(self, path):
+        np.savez(path, **self.weights)
+
+    @property
+    def params(self):
+        return ModelParams(*self.weights["params"].tolist())
+
+    def features(self, intensity, source_scale=1.0, t=None):
+        """Encoded network inputs ``(n, 4 + 2 n_fourier)`` and the amplitude ``intensity * source_scale``."""
+        t = self.duration if t is None else t
+        intensity, source_scale, t = (np.ravel(a) for a in np.broadcast_arrays(
+            np.asarray(intensity, dtype=float), np.asarray(source_scale, dtype=float),
+            np.asarray(t, dtype=float)))
+        # Distance the base flow has carried the plume, which sets where the
+        # peak sits far better than intensity or time alone; its Fourier
+        # features let a small network follow a translating pulse
+        travel = float(self.weights["velocity_per_unit"]) * intensity * t / self.travel_max
+        phase = np.pi * travel[:, None] * np.arange(1, int(self.weights["n_fourier"]) + 1)
+        z = np.column_stack([
+            _encode(*self.intensity_range, intensity),
+            _encode(*self.source_range, source_scale),
+            2.0 * t / self.duration - 1.0,
+            2.0 * travel - 1.0,
+            np.sin(phase),
+            np.cos(phase),
+        ])
+        return z, intensity * source_scale
+
+    def _forward(self, z):
+        activations = [z]
+        h = z
+        for W, b in self.layers[:-1]:
+            h = np.tanh(h @ W + b)
+            activations.append(h)
+        W, b = self.layers[-1]
+        return h @ W + b, activations
+
+    def shape(self, z):
+        """Decoded C / amplitude for encoded inputs ``z``."""
+        coef = self._forward(z)[0]
+        return self.weights["mean"] + coef @ self.weights["decoder"]
+
+    def predict(self, intensity, source_scale=1.0, t=None):
+        """C profiles, ``(n_queries, n_cells)``; inputs broadcast against each other.
+
+        ``t`` defaults to the end of the storm and should lie in
+        [``t_min``, ``duration``].
+        """
+        z, amplitude = self.features(intensity, source_scale, t)
+        return amplitude[:, None] * self.shape(z)
+
+
+def train(spec=SurrogateSpec(), params=ModelParams(), storm=StormEvent(), log=None):
+    """Fit a :class:`Surrogate` to solver runs on the ``spec`` grid of settings.
+
+    ``log(iteration, data_loss, physics_loss)`` is called every 500 steps.
+    """
+    rng = np.random.default_rng(spec.seed)
+    intensity, source = _sample_grid(spec)
+    data = solver_snapshots(intensity, source, spec, params, storm)
+    members, n_snap, n = data["C"].shape
+    t = data["t"]
+    dx = data["x"][1] - data["x"][0]
+
+    # POD basis of every training snapshot, in amplitude-normalized units
+    amplitude = np.repeat(intensity * source, n_snap)[:, None]
+    shapes = data["C"].reshape(-1, n) / amplitude
+    mean = shapes.mean(axis=0)
+    _, _, Vt = np.linalg.svd(shapes - mean, full_matrices=False)
+    basis = Vt[:spec.n_basis]
+    target = (shapes - mean) @ basis.T
+    coef_scale = target.std(axis=0) + 1e-12
+    target /= coef_scale
+    # Data loss is the mean squared shape error relative to its variance,
+    # with early low-norm snapshots up-weighted (capped at early_weight) so
+    # their relative error is not left to dominate
+    norms = np.linalg.norm(shapes, axis=1)
+    row_weight = np.clip((norms.mean() / np.maximum(norms, 1e-12)) ** 2, 1.0, spec.early_weight)
+    data_weight = (row_weight / row_weight.mean())[:, None] * coef_scale ** 2 / np.sum(coef_scale ** 2)
+    decoder = basis * coef_scale[:, None]
+
+    weights = {
+        "x": data["x"], "mean": mean, "decoder": decoder,
+        "duration": np.float64(storm.duration), "t_min": np.float64(spec.t_min),
+        "velocity_per_unit": np.float64(storm.velocity_per_unit),
+        "n_fourier": np.int64(spec.n_fourier), "params": np.array(astuple(params)),
+        "intensity_range": np.array(spec.intensity_range), "source_range": np.array(spec.source_range),
+    }
+    sizes = [4 + 2 * spec.n_fourier, spec.hidden, spec.hidden, spec.n_basis]
+    for k, (fan_in, fan_out) in enumerate(zip(sizes[:-1], sizes[1:])):
+        weights[f"W{k}"] = rng.normal(0.0, np.sqrt(2.0 / (fan_in + fan_out)), (fan_in, fan_out))
+        weights[f"b{k}"] = np.zeros(fan_out)
+    weights["n_layers"] = np.int64(len(sizes) - 1)
+    model = Surrogate(weights)
+    settings = np.repeat(intensity, n_snap), np.repeat(source, n_snap)
+    times = np.tile(t, members)
+    z, _ = model.features(*settings, times)
+
+    # One solver step of G = C / amplitude from each collocation snapshot,
+    # in units of the shape's spread per storm duration:
+    #   ((1 + dt delta) T G(t + dt) - P G(t) - dt (d1 P I / amplitude + load rain(t) profile)) / dt
+    # with T = 1 - dt alpha d2/dx2 symmetric, so it is its own adjoint
+    c_intensity, c_source = _collocation_grid(spec)
+    colloc = solver_snapshots(c_intensity, c_source, spec, params, storm)
+    c_settings = np.repeat(c_intensity, n_snap), np.repeat(c_source, n_snap)
+    c_times = np.tile(t, c_intensity.size)
+    zc, c_amplitude = model.features(*c_settings, c_times)
+    zc_next, _ = model.features(*c_settings, c_times + spec.dt)
+    i0, w = _departures(colloc["U"].reshape(-1, n), spec.dt, dx)
+    profile = np.exp(-((data["x"] - storm.inlet_km) / storm.inlet_width_km) ** 2)
+    rain = np.array([storm.rainfall(tk) for tk in c_times])[:, None]
+    forcing = spec.dt * (params.d1 * _interpolate(colloc["I"].reshape(-1, n), i0, w) / c_amplitude[:, None]
+                         + storm.load_per_unit * rain * profile)
+    residual_scale = storm.duration / shapes.std() / spec.dt
+    decay = 1.0 + spec.dt * params.delta
+    m = z.shape[0]
+    batch = min(spec.physics_batch, zc.shape[0])
+
+    names = [f"{kind}{k}" for k in range(len(sizes) - 1) for kind in ("W", "b")]
+    moments = {name: (np.zeros_like(weights[name]), np.zeros_like(weights[name])) for name in names}
+    beta1, beta2 = 0.9, 0.999
+    for it in range(1, spec.iterations + 1):
+        lr = spec.learning_rate * 0.5 * (1.0 + np.cos(np.pi * it / spec.iterations))
+        rows = rng.choice(zc.shape[0], batch, replace=False)
+        out, acts = model._forward(np.concatenate([z, zc[rows], zc_next[rows]]))
+        a0, ac, an = out[:m], out[m:m + batch], out[m + batch:]
+        err = a0 - target
+        data_loss = float(np.sum(err ** 2 * data_weight) / m)
+
+        i0_r, w_r = i0[rows], w[rows]
+        G, G_next = mean + ac @ decoder, mean + an @ decoder
+        r = residual_scale * (decay * (G_next - spec.dt * params.alpha * _d2dx2(G_next, dx))
+                              - _interpolate(G, i0_r, w_r) - forcing[rows])
+        physics_loss = float(np.mean(r ** 2))
+
+        grad = np.empty_like(out)
+        grad[:m] = 2.0 * err * data_weight / m
+        g = (2.0 * spec.physics_weight * residual_scale / r.size) * r
+        grad[m:m + batch] = -_interpolate_adjoint(g, i0_r, w_r) @ decoder.T
+        grad[m + batch:] = (decay * (g - spec.dt * params.alpha * _d2dx2(g, dx))) @ decoder.T
+
+        # Backpropagation through the tanh layers, then an Adam step
+        for k in range(len(model.layers) - 1, -1, -1):
+            W, _ = model.layers[k]
+            gW = acts[k].T @ grad
+            gb = grad.sum(axis=0)
+            if k:
+                grad = (grad @ W.T) * (1.0 - acts[k] ** 2)
+            for name, gradient in ((f"W{k}", gW), (f"b{k}", gb)):
+                m1, m2 = moments[name]
+                m1 *= beta1
+                m1 += (1 - beta1) * gradient
+                m2 *= beta2
+                m2 += (1 - beta2) * gradient ** 2
+                weights[name] -= lr * (m1 / (1 - beta1 ** it)) / (np.sqrt(m2 / (1 - beta2 ** it)) + 1e-8)
+        if log is not None and (it % 500 == 0 or it == 1):
+            log(it, data_loss, physics_loss)
+    return Surrogate(weights)
+
+
+def check(surrogate, n_members=64, seed=1, params=None, storm=StormEvent(), dt=0.025):
+    """Accuracy and speed against fresh solver runs at random settings and times.
+
+    Each member draws a discharge, a source strength and a solver step in
+    [``surrogate.t_min``, duration] and compares its C profile at that time.
+    Returns relative L2 errors (mean and worst member) with the time of the
+    worst, the worst absolute error as a fraction of the member's peak, and
+    wall times of the batched solver run and of the surrogate query.
+    """
+    rng = np.random.default_rng(seed)
+    params = surrogate.params if params is None else params
+    intensity = np.exp(rng.uniform(*np.log(surrogate.intensity_range), n_members))
+    source = np.exp(rng.uniform(*np.log(surrogate.source_range), n_members))
+    n_steps = int(round(storm.duration / dt))
+    first = max(1, int(np.ceil(surrogate.t_min / dt - 1e-9)))
+    step = rng.integers(first, n_steps + 1, n_members)
+    solver = CUSIRSolver(n_cells=surrogate.x.size, length=float(surrogate.x[-1]), params=params, dt=dt,
+                         batch=n_members)
+    reference = np.empty((n_members, surrogate.x.size))
+    t = np.empty(n_members)
+    steps = 0
+
+    def record(now, state):
+        nonlocal steps
+        steps += 1
+        due = step == steps
+        reference[due] = state[C, due]
+        t[due] = now
+
+    start = time.perf_counter()
+    solver.run(storm, callback=record, intensity=intensity, source_scale=source)
+    solver_s = time.perf_counter() - start
+    start = time.perf_counter()
+    predicted = surrogate.predict(intensity, source, t)
+    surrogate_s = time.perf_counter() - start
+
+    error = predicted - reference
+    scale = np.maximum(np.abs(reference).max(axis=1), 1e-12)
+    rel = np.linalg.norm(error, axis=1) / np.maximum(np.linalg.norm(reference, axis=1), 1e-12)
+    return {
+        "members": n_members,
+        "rel_l2_mean": float(rel.mean()),
+        "rel_l2_max": float(rel.max()),
+        "worst_t_h": float(t[rel.argmax()]),
+        "max_abs_error_frac": float((np.abs(error).max(axis=1) / scale).max()),
+        "solver_s": solver_s,
+        "surrogate_s": surrogate_s,
+    }
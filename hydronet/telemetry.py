@@ -0,0 +1,234 @@
+"""Streaming ingest of node telemetry (pressure, flow, turbidity).
+
+Sources are generators that yield readings in chunks as structured NumPy
+arrays of :data:`READING_DTYPE`: replayed from CSV or JSONL files, read from
+a newline-delimited socket, or synthesized for demos. A
+:class:`TelemetryBuffer` keeps the last ``capacity`` readings of every node in
+fixed-size ring buffers and maintains windowed sums incrementally, so memory
+is constant and the dashboard never re-reads history.
+"""
+import csv
+import itertools
+import json
+import socket
+import threading
+
+import numpy as np
+
+CHANNELS = ("pressure", "flow", "turbidity")
+READING_DTYPE = np.dtype([
+    ("node", np.int64),
+    ("t", np.float64),
+    ("pressure", np.float32),
+    ("flow", np.float32),
+    ("turbidity", np.float32),
+])
+
+
+def _records_to_chunk(records):
+    chunk = np.empty(len(records), dtype=READING_DTYPE)
+    for i, name in enumerate(READING_DTYPE.names):
+        chunk[name] = [r[i] for r in records]
+    return chunk
+
+
+def _chunked(rows, chunk_size):
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, chunk_size))
+        if not batch:
+            return
+        yield _records_to_chunk(batch)
+
+
+def read_csv(path, chunk_size=10_000):
+    """Yield chunks from a CSV with a ``node,t,pressure,flow,turbidity`` header."""
+    with open(path, newline="") as fh:
+        reader = csv.DictReader(fh)
+        missing = set(READING_DTYPE.names) - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"{path} is missing columns: {', '.join(sorted(missing))}")
+        rows = (tuple(row[name] for name in READING_DTYPE.names) for row in reader)
+        yield from _chunked(rows, chunk_size)
+
+
+def _jsonl_rows(lines):
+    for line in lines:
+        line = line.strip()
+        if line:
+            record = json.loads(line)
+            yield tuple(record[name] for name in READING_DTYPE.names)
+
+
+def read_jsonl(path, chunk_size=10_000):
+    """Yield chunks from a JSONL file with one reading object per line."""
+    with open(path) as fh:
+        yield from _chunked(_jsonl_rows(fh), chunk_size)
+
+
+def read_socket(host, port, chunk_size=1_000, timeout=None):
+    """Yield chunks of JSONL readings streamed over a TCP socket.
+
+    Stands in for the LPWAN gateway: anything that writes one JSON reading
+    per line (``nc -l``, a replay script) can feed the twin.
+    """
+    with socket.create_connection((host, port), timeout=timeout) as conn:
+        with conn.makefile("r", encoding="utf-8") as fh:
+            yield from _chunked(_jsonl_rows(fh), chunk_size)
+
+
+def synthetic_readings(n_nodes, seconds, start=0.0, seed=0, chunk_seconds=1):
+    """Yield ``chunk_seconds`` of 1 Hz readings from ``n_nodes`` at a time.
+
+    Turbidity rises through a storm pulse that reaches nodes at different
+    times; a few nodes carry a persistent high load.
+    """
+    rng = np.random.default_rng(seed)
+    nodes = np.arange(n_nodes)
+    lag = rng.uniform(0.0, 0.5, n_nodes) * seconds
+    dirty = rng.random(n_nodes) < 0.05
+    for t0 in range(0, int(seconds), int(chunk_seconds)):
+        ticks = np.arange(t0, min(t0 + chunk_seconds, seconds))
+        chunk = np.empty(ticks.size * n_nodes, dtype=READING_DTYPE)
+        chunk["node"] = np.tile(nodes, ticks.size)
+        t = np.repeat(ticks, n_nodes)
+        chunk["t"] = start + t
+        storm = np.exp(-((t - np.tile(lag, ticks.size)) / (0.1 * seconds + 1)) ** 2)
+        chunk["flow"] = 0.02 + 0.3 * storm + rng.normal(0, 0.005, chunk.size)
+        chunk["pressure"] = 101.3 + 8.0 * storm + rng.normal(0, 0.2, chunk.size)
+        chunk["turbidity"] = (5.0 + 120.0 * storm + 40.0 * np.tile(dirty, ticks.size)
+                              + rng.normal(0, 1.0, chunk.size))
+        yield chunk
+
+
+class TelemetryBuffer:
+    """Per-node ring buffers of the last ``capacity`` readings.
+
+    ``values`` is ``(n_nodes, capacity, n_channels)`` float32 and ``times`` is
+    ``(n_nodes, capacity)``; both are allocated once. Window sums and sums of
+    squares are updated as readings enter and leave the ring, so
+    :meth:`window_stats` is O(n_nodes) regardless of history length.
+    """
+
+    def __init__(self, n_nodes, capacity=300, resync_every=1000):
+        self.n_nodes = int(n_nodes)
+        self.capacity = int(capacity)
+        self.resync_every = int(resync_every)
+        n_ch = len(CHANNELS)
+        self.values = np.zeros((self.n_nodes, self.capacity, n_ch), dtype=np.float32)
+        self.times = np.full((self.n_nodes, self.capacity), np.nan)
+        self.head = np.zeros(self.n_nodes, dtype=np.int64)     # next slot to write
+        self.count = np.zeros(self.n_nodes, dtype=np.int64)    # filled slots
+        self._sum = np.zeros((self.n_nodes, n_ch))
+        self._sumsq = np.zeros((self.n_nodes, n_ch))
+        self.ingested = 0
+        self.dropped = 0
+        self._chunks = 0
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.times.nbytes + self._sum.nbytes + self._sumsq.nbytes
+
+    def ingest(self, chunk):
+        """Append a chunk of readings (any node order, chronological per node)."""
+        node = chunk["node"]
+        ok = (node >= 0) & (node < self.n_nodes)
+        if not ok.all():
+            self.dropped += int((~ok).sum())
+            chunk, node = chunk[ok], node[ok]
+        if not chunk.size:
+            return
+
+        # Rank of each reading among its node's readings in this chunk
+        order = np.argsort(node, kind="stable")
+        chunk, node = chunk[order], node[order]
+        per_node = np.bincount(node, minlength=self.n_nodes)
+        starts = np.cumsum(per_node) - per_node
+        rank = np.arange(node.size) - starts[node]
+        # Readings that would be overwritten within this same chunk never land
+        excess = np.maximum(per_node - self.capacity, 0)
+        rank -= excess[node]
+        keep = rank >= 0
+        chunk, node, rank = chunk[keep], node[keep], rank[keep]
+        per_node -= excess
+
+        slot = (self.head[node] + rank) % self.capacity
+        new = np.stack([chunk[name] for name in CHANNELS], axis=1).astype(np.float32)
+        old = self.values[node, slot].astype(np.float64)
+        evicted = ~np.isnan(self.times[node, slot])
+        old[~evicted] = 0.0
+        delta = new.astype(np.float64) - old
+        deltasq = new.astype(np.float64) ** 2 - old ** 2
+        for k in range(len(CHANNELS)):
+            self._sum[:, k] += np.bincount(node, weights=delta[:, k], minlength=self.n_nodes)
+            self._sumsq[:, k] += np.bincount(node, weights=deltasq[:, k], minlength=self.n_nodes)
+
+        self.values[node, slot] = new
+        self.times[node, slot] = chunk["t"]
+        self.head += per_node
+        self.head %= self.capacity
+        self.count += per_node
+        np.minimum(self.count, self.capacity, out=self.count)
+        self.ingested += int(chunk.size)
+        self._chunks += 1
+        if self._chunks % self.resync_every == 0:
+            self.resync()
+
+    def resync(self):
+        """Recompute window sums from the rings to shed float drift."""
+        filled = ~np.isnan(self.times)
+        vals = np.where(filled[..., None], self.values.astype(np.float64), 0.0)
+        self._sum = vals.sum(axis=1)
+        self._sumsq = (vals ** 2).sum(axis=1)
+
+    def window_stats(self):
+        """Per-node window mean, std, latest value and latest timestamp."""
+        n = np.maximum(self.count, 1)[:, None]
+        mean = self._sum / n
+        var = np.maximum(self._sumsq / n - mean ** 2, 0.0)
+        last = (self.head - 1) % self.capacity
+        idx = np.arange(self.n_nodes)
+        latest = self.values[idx, last].astype(np.float64)
+        latest_t = self.times[idx, last]
+        empty = self.count == 0
+        mean[empty] = np.nan
+        latest[empty] = np.nan
+        return {"count": self.count.copy(), "mean": mean, "std": np.sqrt(var),
+                "latest": latest, "latest_t": latest_t}
+
+    def recent(self, node):
+        """Chronological ``(times, values)`` copy of one node's window."""
+        n = int(self.count[node])
+        idx = (self.head[node] - n + np.arange(n)) % self.capacity
+        return self.times[node, idx], self.values[node, idx]
+
+
+class TelemetryFeed:
+    """Pairs a chunk source with a buffer; :meth:`pump` pulls only new data.
+
+    Pumping is serialized so one feed can be shared between sessions. Each
+    of ``sinks`` (anything with ``write(chunk)``, e.g. a
+    :class:`hydronet.store.StoreWriter` or :class:`hydronet.clog.CartridgeBank`)
+    also receives every chunk.
+    """
+
+    def __init__(self, source, buffer, sinks=()):
+        self.source = iter(source)
+        self.buffer = buffer
+        self.sinks = list(sinks)
+        self.exhausted = False
+        self._lock = threading.Lock()
+
+    def pump(self, max_chunks=None):
+        """Ingest up to ``max_chunks`` chunks; return the number of readings."""
+        with self._lock:
+            before = self.buffer.ingested
+            pulled = 0
+            for chunk in itertools.islice(self.source, max_chunks):
+                self.buffer.ingest(chunk)
+                for sink in self.sinks:
+                    sink.write(chunk)
+                pulled += 1
+            if max_chunks is None or pulled < max_chunks:
+                self.exhausted = True
+            return self.buffer.ingested - before
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from hydronet.cache import SimulationCache, cache_key
+from hydronet.solver import ModelParams, StormEvent
+
+
+def _arrays(n, value=0.0):
+    return {"x": np.full(n, value)}
+
+
+def test_key_is_stable_and_order_independent():
+    a = cache_key(storm=StormEvent(intensity=5.0), n_cells=400, params=ModelParams(), hours=(0.5, 1.0))
+    b = cache_key(hours=[0.5, 1.0], params=ModelParams(), n_cells=np.int64(400),
+                  storm=StormEvent(intensity=5.0))
+    assert a == b
+    assert len(a) == 32
+    assert a != cache_key(storm=StormEvent(intensity=5.5), n_cells=400, params=ModelParams(),
+                          hours=(0.5, 1.0))
+    assert a != cache_key(storm=StormEvent(intensity=5.0), n_cells=400, params=ModelParams(delta=0.2),
+                          hours=(0.5, 1.0))
+
+
+def test_key_hashes_whole_arrays():
+    base = np.zeros(2000)
+    changed = base.copy()
+    changed[1000] = 1.0
+    assert cache_key(v=base) == cache_key(v=np.zeros(2000))
+    assert cache_key(v=base) != cache_key(v=changed)
+    assert cache_key(v=base) != cache_key(v=base.astype(np.float32))
+    assert cache_key(v=base) != cache_key(v=base.reshape(40, 50))
+
+
+def test_key_rejects_values_it_cannot_represent():
+    with pytest.raises(TypeError):
+        cache_key(v=object())
+    with pytest.raises(TypeError):
+        cache_key(v={1, 2})
+
+
+def test_lru_evicts_by_count_and_bytes():
+    cache = SimulationCache(max_entries=2, max_bytes=10 * 8)
+    cache.put("a", _arrays(4))
+    cache.put("b", _arrays(4))
+    assert cache.get("a") is not None       # a is now most recent
+    cache.put("c", _arrays(4))
+    assert "b" not in cache and "a" in cache and "c" in cache
+    cache.put("d", _arrays(8))
+    assert len(cache) == 1 and "d" in cache
+    assert cache.stats()["evictions"] == 3
+
+
+def test_results_are_read_only():
+    arrays = SimulationCache().put("a", _arrays(3))
+    with pytest.raises(ValueError):
+        arrays["x"][0] = 1.0
+
+
+def test_get_or_compute_computes_once():
+    cache = SimulationCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return _arrays(3, 2.0)
+
+    first = cache.get_or_compute(compute, n=3)
+    second = cache.get_or_compute(compute, n=3)
+    assert calls == [1]
+    assert second is first
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_rate"] == pytest.approx(0.5)
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    SimulationCache(disk_dir=tmp_path).put("k", _arrays(5, 3.0))
+    cache = SimulationCache(disk_dir=tmp_path)
+    assert "k" in cache and len(cache) == 0
+    np.testing.assert_array_equal(cache.get("k")["x"], np.full(5, 3.0))
+    assert cache.stats()["disk_hits"] == 1
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_disk_tier_is_bounded_and_drops_corrupt_files(tmp_path):
+    cache = SimulationCache(disk_dir=tmp_path, max_disk_entries=3)
+    for i in range(5):
+        cache.put(f"k{i}", _arrays(2, i))
+    assert len(list(tmp_path.glob("*.npz"))) == 3
+    (tmp_path / "bad.npz").write_bytes(b"not a zip")
+    assert SimulationCache(disk_dir=tmp_path).get("bad") is None
+    assert not (tmp_path / "bad.npz").exists()
@@ -0,0 +1,96 @@
+import csv
+
+import numpy as np
+import pytest
+
+from hydronet.cli import check_scenarios, main, read_scenarios, run_scenario
+from hydronet.network import PipeNetwork
+
+
+@pytest.fixture(scope="module")
+def network_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("net") / "net.npz"
+    PipeNetwork.synthetic(40, seed=2).save(path)
+    return path
+
+
+def _csv(tmp_path, text):
+    path = tmp_path / "scenarios.csv"
+    path.write_text(text)
+    return path
+
+
+def test_read_scenarios(tmp_path):
+    path = _csv(tmp_path, "name,intensity,duration_h,saturation\n wet ,40,1.5,\ndry,5,,0.2\n")
+    assert read_scenarios(path) == [
+        {"name": "wet", "intensity": 40.0, "duration_h": 1.5},
+        {"name": "dry", "intensity": 5.0, "saturation": 0.2},
+    ]
+
+
+@pytest.mark.parametrize("text, line", [
+    ("name,intensity\nok,10\nbad\n", 3),
+    ("name,intensity\nok,ten\n", 2),
+])
+def test_read_scenarios_names_the_bad_line(tmp_path, text, line):
+    with pytest.raises(ValueError, match=f"line {line}"):
+        read_scenarios(_csv(tmp_path, text))
+
+
+def test_read_scenarios_needs_columns(tmp_path):
+    with pytest.raises(ValueError, match="columns"):
+        read_scenarios(_csv(tmp_path, "scenario,q\na,1\n"))
+
+
+@pytest.mark.parametrize("scenario, message", [
+    ({"name": "a/b", "intensity": 10.0}, "names"),
+    ({"name": "..", "intensity": 10.0}, "names"),
+    ({"name": "zero", "intensity": 0.0}, "intensity"),
+    ({"name": "nan", "intensity": float("nan")}, "intensity"),
+    ({"name": "short", "intensity": 10.0, "duration_h": -1.0}, "duration_h"),
+    ({"name": "full", "intensity": 10.0, "saturation": 1.5}, "saturation"),
+])
+def test_check_scenarios_rejects(scenario, message):
+    with pytest.raises(ValueError, match=message):
+        check_scenarios([scenario])
+
+
+def test_check_scenarios_needs_unique_names():
+    with pytest.raises(ValueError, match="unique"):
+        check_scenarios([{"name": "a", "intensity": 1.0}, {"name": "a", "intensity": 2.0}])
+    with pytest.raises(ValueError, match="no scenarios"):
+        check_scenarios([])
+
+
+def test_run_scenario_outputs(network_file):
+    network = PipeNetwork.load_file(network_file)
+    summary, arrays = run_scenario(network, {"name": "s", "intensity": 30.0, "duration_h": 0.5})
+    assert summary["scenario"] == "s" and summary["duration_h"] == 0.5
+    assert arrays["t_h"].shape == (20,)
+    assert arrays["outfall_load_mg_s"].shape == (20, network.outfalls.size)
+    assert arrays["peak_concentration"].shape == (network.n_nodes,)
+    assert summary["outfall_mass_kg"] > 0
+    assert np.all(arrays["saturation"] >= 0)
+
+
+def test_forecast_writes_summary_and_arrays(network_file, tmp_path):
+    scenarios = _csv(tmp_path, "name,intensity,duration_h\nlight,5,0.25\nheavy,60,0.25\n")
+    out = tmp_path / "out"
+    assert main(["forecast", str(network_file), "--scenarios", str(scenarios), "-o", str(out),
+                 "-j", "2", "-q"]) == 0
+    with open(out / "summary.csv") as fh:
+        rows = list(csv.DictReader(fh))
+    assert [row["scenario"] for row in rows] == ["light", "heavy"]
+    assert float(rows[1]["outfall_mass_kg"]) > float(rows[0]["outfall_mass_kg"])
+    with np.load(out / "scenarios" / "heavy.npz") as data:
+        assert data["t_h"].size == 10
+
+
+def test_forecast_rejects_bad_input_before_running(network_file, tmp_path, capsys):
+    out = tmp_path / "out"
+    assert main(["forecast", str(network_file), "--intensity", "0", "-o", str(out)]) == 2
+    assert "intensity must be positive" in capsys.readouterr().err
+    bad = _csv(tmp_path, "name,intensity\nbad\n")
+    assert main(["forecast", str(network_file), "--scenarios", str(bad), "-o", str(out)]) == 2
+    assert "line 2" in capsys.readouterr().err
+    assert not out.exists()
@@ -0,0 +1,58 @@
+import numpy as np
+
+from hydronet.clog import CartridgeBank, CartridgeSpec
+from hydronet.telemetry import READING_DTYPE
+
+
+def _bank(saturation, rate):
+    bank = CartridgeBank(len(saturation))
+    bank.mass[:] = np.asarray(saturation) * bank.spec.capacity_g
+    bank.rate[:] = rate
+    return bank
+
+
+def test_queue_ranks_by_hours_then_saturation():
+    spec = CartridgeSpec()
+    bank = _bank([0.10, 0.95, 0.97, 0.30, 0.20, 0.40], [50.0, 0.0, 0.0, 500.0, 0.0, 0.0])
+    queue = bank.maintenance_queue()
+    hours = bank.time_to_bypass()
+    # Nodes 1 and 2 are past the threshold at design flow: 0 h, more saturated first
+    assert bank.bypass_saturation(spec.design_flow) < 0.95
+    assert list(queue["node"][:2]) == [2, 1]
+    assert list(queue["node"][2:4]) == [3, 0]
+    # Idle units never bypass; ties fall back to saturation, then node id
+    assert list(queue["node"][4:]) == [5, 4]
+    assert np.isinf(queue["hours_to_bypass"][4:]).all()
+    np.testing.assert_array_equal(queue["hours_to_bypass"], hours[queue["node"]])
+    assert np.all(np.diff(queue["hours_to_bypass"][:4]) >= 0)
+
+
+def test_queue_limit_and_horizon():
+    bank = _bank([0.1, 0.2, 0.3, 0.0], [100.0, 200.0, 300.0, 0.0])
+    full = bank.maintenance_queue()
+    np.testing.assert_array_equal(bank.maintenance_queue(limit=2)["node"], full["node"][:2])
+    horizon = full["hours_to_bypass"][1]
+    within = bank.maintenance_queue(horizon_h=horizon)
+    np.testing.assert_array_equal(within["node"], full["node"][:2])
+    assert 3 not in bank.maintenance_queue(horizon_h=1e9)["node"]
+
+
+def test_past_threshold_is_due_now_even_without_loading():
+    bank = _bank([0.99], [0.0])
+    assert bank.time_to_bypass()[0] == 0.0
+
+
+def test_ingest_integrates_loading_per_node():
+    spec = CartridgeSpec()
+    bank = CartridgeBank(2, spec)
+    chunk = np.zeros(6, dtype=READING_DTYPE)
+    chunk["node"] = [0, 1, 0, 1, 0, 7]
+    chunk["t"] = [0.0, 0.0, 3600.0, 1800.0, 7200.0, 0.0]
+    chunk["flow"] = 1.0                     # above design flow, so capped
+    chunk["turbidity"] = 10.0
+    bank.ingest(chunk)
+    per_hour = spec.efficiency * spec.design_flow * 10.0 * spec.tss_per_ntu * 3600.0
+    np.testing.assert_allclose(bank.mass, [2 * per_hour, 0.5 * per_hour])
+    np.testing.assert_array_equal(bank.last_t, [7200.0, 1800.0])
+    bank.replace([0])
+    assert bank.mass[0] == 0.0
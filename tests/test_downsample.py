@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from hydronet.downsample import downsample, lttb_indices, minmax_indices, visible_slice
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(3)
+    x = np.cumsum(rng.uniform(0.1, 1.0, 10_001))
+    y = np.sin(x / 50.0) + rng.normal(0, 0.1, x.size)
+    y[4321] = 25.0
+    return x, y
+
+
+@pytest.mark.parametrize("n_out", [3, 4, 17, 1000, 9999])
+def test_lttb_keeps_endpoints_and_one_point_per_bucket(series, n_out):
+    x, y = series
+    keep = lttb_indices(x, y, n_out)
+    assert keep.size == n_out
+    assert keep[0] == 0 and keep[-1] == x.size - 1
+    assert np.all(np.diff(keep) > 0)
+    n_buckets = n_out - 2
+    edges = 1 + (np.arange(n_buckets + 1) * (x.size - 2)) // n_buckets
+    interior = keep[1:-1]
+    assert np.all((interior >= edges[:-1]) & (interior < edges[1:]))
+
+
+def test_lttb_passes_short_series_through(series):
+    x, y = series
+    np.testing.assert_array_equal(lttb_indices(x[:10], y[:10], 50), np.arange(10))
+    with pytest.raises(ValueError):
+        lttb_indices(x, y, 2)
+
+
+@pytest.mark.parametrize("n_out", [2, 3, 100, 2001])
+def test_minmax_keeps_extremes_and_endpoints(series, n_out):
+    x, y = series
+    keep = minmax_indices(y, n_out)
+    assert keep[0] == 0 and keep[-1] == y.size - 1
+    assert np.all(np.diff(keep) > 0)
+    assert keep.max() < y.size
+    assert y.argmax() in keep and y.argmin() in keep
+    assert keep.size <= n_out + 2
+
+
+def test_visible_slice_includes_one_neighbour_each_side():
+    x = np.arange(100.0)
+    window = visible_slice(x, (10.5, 20.5))
+    assert (window.start, window.stop) == (10, 22)
+    assert visible_slice(x, (-5, 500)) == slice(0, 100)
+
+
+def test_downsample_respects_range_and_budget(series):
+    x, y = series
+    for method in ("lttb", "minmax"):
+        xs, ys = downsample(x, y, n_out=500, method=method, x_range=(x[1000], x[8000]))
+        assert len(xs) <= 502
+        assert xs[0] == x[999] and xs[-1] == x[8001]
+        assert ys.max() == y.max()
+    with pytest.raises(ValueError):
+        downsample(x, y, n_out=10, method="nearest")
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from hydronet import ensemble
+from hydronet.ensemble import EnsembleSpec, percentile_bands, run_ensemble, sample_members
+from hydronet.solver import CUSIRSolver, StormEvent
+
+
+def test_members_are_stratified_by_diffusivity():
+    spec = EnsembleSpec(n_members=64, diffusion_levels=8, seed=3)
+    members = sample_members(spec)
+    scale = members["diffusion_scale"]
+    assert np.all(np.diff(scale) >= 0)
+    assert np.unique(scale).size == 8
+    assert np.all(np.bincount(np.unique(scale, return_inverse=True)[1]) == 8)
+    assert np.median(scale) == pytest.approx(1.0, abs=0.05)
+    np.testing.assert_array_equal(sample_members(spec)["intensity"], members["intensity"])
+    assert np.all(members["intensity"] > 0) and np.all(members["source_scale"] > 0)
+
+
+def test_ensemble_matches_single_runs():
+    spec = EnsembleSpec(n_members=6, diffusion_levels=3, seed=1)
+    x, states, members = run_ensemble(spec, n_cells=60)
+    assert states.shape == (6, 5, 60)
+    for k in (0, 3, 5):
+        solver = CUSIRSolver(n_cells=60, diffusion_scale=members["diffusion_scale"][k:k + 1])
+        single = solver.run(StormEvent(), intensity=members["intensity"][k:k + 1],
+                            source_scale=members["source_scale"][k:k + 1])
+        np.testing.assert_allclose(states[k], single[:, 0], rtol=1e-12, atol=1e-15)
+
+
+def test_block_size_does_not_change_results(monkeypatch):
+    spec = EnsembleSpec(n_members=7, diffusion_levels=2)
+    _, whole, _ = run_ensemble(spec, n_cells=50)
+    monkeypatch.setattr(ensemble, "BLOCK_CELLS", 100)    # blocks of two members
+    _, blocked, _ = run_ensemble(spec, n_cells=50)
+    np.testing.assert_allclose(blocked, whole, rtol=1e-12, atol=1e-15)
+
+
+def test_percentile_bands():
+    values = np.arange(101.0)[:, None] * np.ones((1, 4))
+    bands = percentile_bands(values)
+    assert bands.shape == (5, 4)
+    np.testing.assert_allclose(bands[:, 0], [5, 25, 50, 75, 95])
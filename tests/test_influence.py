@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from hydronet.influence import InfluenceModel
+from hydronet.network import PipeNetwork
+
+
+@pytest.fixture(scope="module")
+def network():
+    return PipeNetwork.synthetic(120, seed=5)
+
+
+def test_batched_influence_matches_dense_inverse(network):
+    model = InfluenceModel(network)
+    A = network.transfer_matrix().toarray()
+    R = np.random.default_rng(0).random((network.n_nodes, 3))
+    expected = np.linalg.solve(np.eye(network.n_nodes) - A, R)
+    np.testing.assert_allclose(model.influence(R), expected, rtol=1e-10)
+    np.testing.assert_allclose(model.influence(sparse.csr_matrix(R)), expected, rtol=1e-10)
+    np.testing.assert_allclose(model.influence(R[:, 0]), expected[:, :1], rtol=1e-10)
+
+
+def test_adjoint_matches_forward_injection(network):
+    # Influence of node j on the outfalls equals the outfall load of a unit
+    # load injected at j
+    model = InfluenceModel(network)
+    A = network.transfer_matrix().toarray()
+    g = model.influence([network.outfalls])[:, 0]
+    for j in (0, 7, 60, 119):
+        w = np.zeros(network.n_nodes)
+        w[j] = 1.0
+        M = np.linalg.solve(np.eye(network.n_nodes) - A.T, w)
+        assert g[j] == pytest.approx(M[network.outfalls].sum(), rel=1e-10)
+
+
+def test_rank(network):
+    model = InfluenceModel(network)
+    ranked = model.rank()
+    assert sorted(ranked["node"]) == list(range(network.n_nodes))
+    assert np.all(np.diff(ranked["exposure"]) <= 0)
+    assert ranked["contribution"].sum() == pytest.approx(1.0)
+    # A load at an outfall reaches the outfall in full
+    outfall = ranked["outfall_influence"][np.isin(ranked["node"], network.outfalls)]
+    np.testing.assert_allclose(outfall, 1.0)
+    assert np.all(ranked["outfall_influence"] <= 1.0 + 1e-12)
+    top = model.rank(by="contribution", top=5)
+    assert top["node"].size == 5 and np.all(np.diff(top["contribution"]) <= 0)
+    with pytest.raises(ValueError):
+        model.rank(by="pagerank")
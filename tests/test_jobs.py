@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from hydronet.jobs import CANCELLED, DONE, FAILED, JobManager, JobQueueFull
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(max_workers=1, max_queued=2, history=4)
+    yield manager
+    manager.shutdown()
+
+
+def test_same_key_returns_the_same_job(manager):
+    release = threading.Event()
+    calls = []
+
+    def work(job, value):
+        calls.append(value)
+        release.wait(5)
+        return value * 2
+
+    first = manager.submit("a", work, 1)
+    second = manager.submit("a", work, 99)
+    assert second is first
+    release.set()
+    assert first.wait(5)
+    assert manager.submit("a", work, 3) is first
+    assert calls == [1]
+    assert first.snapshot()["status"] == DONE and first.result == 2
+
+
+def test_failed_job_is_reported_then_started_afresh(manager):
+    attempts = []
+
+    def flaky(job):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("solver diverged")
+        return "ok"
+
+    job = manager.submit("b", flaky)
+    assert job.wait(5)
+    snap = job.snapshot()
+    assert snap["status"] == FAILED
+    assert snap["error"] == "RuntimeError: solver diverged"
+    # get() never resubmits; submit() after a failure does
+    assert manager.get("b") is job
+    retry = manager.submit("b", flaky)
+    assert retry is not job
+    assert retry.wait(5) and retry.result == "ok"
+    assert len(attempts) == 2
+
+
+def test_publish_and_cancel(manager):
+    started = threading.Event()
+
+    def loop(job):
+        started.set()
+        while True:
+            job.publish(0.5, x=[1.0, 2.0])
+
+    job = manager.submit("c", loop)
+    assert started.wait(5)
+    job.cancel()
+    assert job.wait(5)
+    assert job.status == CANCELLED
+    assert manager.submit("c", lambda job: 1) is not job
+
+
+def test_queue_bound(manager):
+    started, release = threading.Event(), threading.Event()
+
+    def block(job):
+        started.set()
+        release.wait(5)
+
+    manager.submit("running", block)
+    assert started.wait(5)
+    manager.submit("q1", lambda job: None)
+    manager.submit("q2", lambda job: None)
+    with pytest.raises(JobQueueFull):
+        manager.submit("q3", lambda job: None)
+    release.set()
+
+
+def test_discard_forgets_only_finished_jobs(manager):
+    release = threading.Event()
+    running = manager.submit("d", lambda job: release.wait(5))
+    manager.discard("d")
+    assert manager.get("d") is running
+    release.set()
+    assert running.wait(5)
+    assert manager.submit("d", lambda job: None) is running
+    manager.discard("d")
+    assert manager.get("d") is None
+    rerun = manager.submit("d", lambda job: "again")
+    assert rerun is not running
+    assert rerun.wait(5) and rerun.result == "again"
+    manager.discard("missing")
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from hydronet.media import MediaCache
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def photo(tmp_path):
+    path = tmp_path / "site photo.png"
+    Image.new("RGB", (640, 480), (30, 120, 200)).save(path)
+    return path
+
+
+def test_variant_is_resized_and_reused(tmp_path, photo):
+    cache = MediaCache(root=tmp_path / "cache")
+    variant = cache.image(photo, 160)
+    assert os.path.basename(variant).startswith("site_photo-")
+    with Image.open(variant) as img:
+        assert img.size == (160, 120)
+    mtime = os.stat(variant).st_mtime_ns
+    assert MediaCache(root=tmp_path / "cache").image(photo, 160) == variant
+    assert os.stat(variant).st_mtime_ns == mtime
+    # Never upscaled
+    with Image.open(cache.image(photo, 2000)) as img:
+        assert img.size == (640, 480)
+
+
+def test_changed_source_gets_a_new_variant(tmp_path, photo):
+    cache = MediaCache(root=tmp_path / "cache")
+    before = cache.image(photo, 160)
+    Image.new("RGB", (320, 320), (200, 30, 30)).save(photo)
+    os.utime(photo, ns=(1, 1))
+    after = cache.image(photo, 160)
+    assert after != before
+    with Image.open(after) as img:
+        assert img.size == (160, 160)
+
+
+def test_non_images_pass_through(tmp_path):
+    doc = tmp_path / "brief.pdf"
+    doc.write_bytes(b"%PDF-1.4")
+    assert MediaCache(root=tmp_path / "cache").image(doc, 100) == str(doc)
+
+
+def test_data_uri_and_pregenerate(tmp_path, photo):
+    cache = MediaCache(root=tmp_path / "cache")
+    assert cache.data_uri(photo, 32).startswith("data:image/")
+    variants = cache.pregenerate([photo], widths=(32, 64))
+    assert len(variants) == 2 and all(os.path.exists(v) for v in variants)
+    assert not list((tmp_path / "cache").glob("tmp*"))
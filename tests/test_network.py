@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from scipy.sparse.linalg import spsolve
+
+from hydronet.network import NetworkTransport, PipeNetwork
+from hydronet.solver import ModelParams, StormEvent
+
+
+@pytest.fixture
+def diamond():
+    # 0 splits into 1 and 2, which rejoin at 3 and drain to the outfall 4
+    return PipeNetwork(5, [0, 0, 1, 2, 3], [1, 2, 3, 3, 4], [0.2, 0.3, 0.25, 0.1, 0.4],
+                       [0.3, 0.2, 0.3, 0.2, 0.4], runoff=[2e-3, 1e-3, 1e-3, 5e-4, 1e-3],
+                       load=[1.0, 2.0, 0.5, 1.0, 1.0])
+
+
+def test_topological_order_is_upstream_first(diamond):
+    network = PipeNetwork.synthetic(300, seed=1)
+    for net in (diamond, network):
+        position = np.empty(net.n_nodes, dtype=np.int64)
+        position[net.topological_order()] = np.arange(net.n_nodes)
+        assert np.all(position[net.src] < position[net.dst])
+    with pytest.raises(ValueError, match="cycle"):
+        PipeNetwork(2, [0, 1], [1, 0], [1.0, 1.0], [0.3, 0.3]).topological_order()
+
+
+def test_flows_are_conserved(diamond):
+    flows = diamond.node_flows(20.0)
+    edge = diamond.edge_flows(20.0)
+    inflow = np.bincount(diamond.dst, weights=edge, minlength=diamond.n_nodes)
+    np.testing.assert_allclose(flows, diamond.runoff * 20.0 + inflow)
+    np.testing.assert_allclose(flows[diamond.outfalls].sum(), diamond.runoff.sum() * 20.0)
+
+
+@pytest.mark.parametrize("build", [
+    lambda: PipeNetwork(5, [0, 0, 1, 2, 3], [1, 2, 3, 3, 4], [0.2, 0.3, 0.25, 0.1, 0.4],
+                        [0.3, 0.2, 0.3, 0.2, 0.4], runoff=[2e-3, 1e-3, 1e-3, 5e-4, 1e-3]),
+    lambda: PipeNetwork.synthetic(200, seed=3),
+])
+def test_steady_state_conserves_mass(build):
+    # Without decay, everything washed in upstream of the outfalls leaves them
+    network = build()
+    transport = NetworkTransport(network, 25.0, params=ModelParams(delta=0.0), dx_km=0.02)
+    transport.concentration[:] = spsolve(-transport.operator.tocsc(), transport.source)
+    routed = network.out_degree > 0
+    injected = 1e3 * np.sum((network.runoff * 25.0 * network.load)[routed])
+    np.testing.assert_allclose(transport.outfall_load().sum(), injected, rtol=1e-9)
+
+
+def test_decay_removes_mass(diamond):
+    lossless = NetworkTransport(diamond, 25.0, params=ModelParams(delta=0.0))
+    decaying = NetworkTransport(diamond, 25.0)
+    loads = []
+    for transport in (lossless, decaying):
+        transport.concentration[:] = spsolve(-transport.operator.tocsc(), transport.source)
+        loads.append(transport.outfall_load().sum())
+    assert 0 < loads[1] < loads[0]
+
+
+def test_storm_run_is_finite_and_reaches_the_outfall(diamond):
+    transport = NetworkTransport(diamond, 30.0, dt=0.05)
+    loads = []
+    final = transport.run(StormEvent(intensity=30.0),
+                          callback=lambda t, c: loads.append(transport.outfall_load()))
+    assert len(loads) == 50
+    assert np.all(np.isfinite(final)) and final.min() >= -1e-12
+    assert max(load.sum() for load in loads) > 0
+    assert transport.distance_to_outfall().shape == (transport.n_cells,)
+
+
+def test_save_and_load(tmp_path, diamond):
+    diamond.save(tmp_path / "net.npz")
+    loaded = PipeNetwork.load_file(tmp_path / "net.npz")
+    np.testing.assert_array_equal(loaded.dst, diamond.dst)
+    np.testing.assert_array_equal(loaded.load, diamond.load)
+    (tmp_path / "net.csv").write_text("src,dst,length_km,diameter_m\n0,1,0.1,0.3\n1,2,0.2,0.3\n")
+    loaded = PipeNetwork.load_file(tmp_path / "net.csv")
+    assert loaded.n_nodes == 3 and list(loaded.outfalls) == [2]
+    (tmp_path / "bad.csv").write_text("src,dst\n0,1\n")
+    with pytest.raises(ValueError, match="diameter_m"):
+        PipeNetwork.load_file(tmp_path / "bad.csv")
+
+
+def test_rejects_bad_edges():
+    with pytest.raises(ValueError):
+        PipeNetwork(2, [0], [2], [1.0], [0.3])
+    with pytest.raises(ValueError):
+        PipeNetwork(2, [0], [1], [0.0], [0.3])
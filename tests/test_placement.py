@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from hydronet.clog import CartridgeSpec
+from hydronet.network import PipeNetwork
+from hydronet.placement import PlacementOptimizer, TransferSystem
+
+
+@pytest.fixture(scope="module")
+def network():
+    return PipeNetwork.synthetic(150, seed=4)
+
+
+def dense_outfall_load(network, placed, efficiency=0.8, intensity=30.0,
+                       design_flow=CartridgeSpec.design_flow):
+    """Solve M = E (w + A^T M) directly with a dense matrix."""
+    A = network.transfer_matrix(intensity).toarray()
+    capture = np.minimum(1.0, design_flow / network.node_flows(intensity))
+    keep = np.ones(network.n_nodes)
+    keep[placed] -= efficiency * capture[placed]
+    E = np.diag(keep)
+    M = np.linalg.solve(np.eye(network.n_nodes) - E @ A.T, E @ network.runoff_load(intensity))
+    return M[network.outfalls].sum()
+
+
+@pytest.mark.parametrize("placed", [[], [0], [3, 17, 42], list(range(0, 150, 7))])
+def test_score_matches_dense_solve(network, placed):
+    system = TransferSystem.build(network)
+    assert system.outfall_load(placed) == pytest.approx(dense_outfall_load(network, placed), rel=1e-10)
+
+
+def test_capture_limits_removal_at_large_nodes(network):
+    flows = network.node_flows(30.0)
+    big = int(flows.argmax())
+    assert flows[big] > CartridgeSpec.design_flow
+    system = TransferSystem.build(network)
+    baseline = system.outfall_load()
+    full = TransferSystem.build(network, design_flow=np.inf)
+    assert baseline - system.outfall_load([big]) < baseline - full.outfall_load([big])
+    assert system.outfall_load([big]) == pytest.approx(dense_outfall_load(network, [big]), rel=1e-10)
+
+
+def test_pool_scores_match_in_process(network):
+    placements = [[], [5], [1, 2, 3], [10, 60, 120]]
+    with PlacementOptimizer(network, max_workers=2) as optimizer:
+        pooled = optimizer.score_many(placements)
+        local = [optimizer.score(p) for p in placements]
+        placed, history = optimizer.greedy(3, n_candidates=20)
+    np.testing.assert_allclose(pooled, local, rtol=1e-12)
+    assert len(set(placed.tolist())) == 3
+    assert np.all(np.diff(history) <= 0)
+    assert history[-1] == pytest.approx(dense_outfall_load(network, placed), rel=1e-10)
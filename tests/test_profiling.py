@@ -0,0 +1,69 @@
+import pstats
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from hydronet.profiling import Profiler, finish_capture, start_capture
+
+
+@pytest.fixture
+def tracing():
+    profiler = Profiler()
+    profiler.trace_memory = True
+    yield profiler
+    profiler.trace_memory = False
+
+
+def test_sections_record_wall_time_and_extra_metrics():
+    profiler = Profiler(window=3)
+    for size in range(5):
+        with profiler.section("render") as sample:
+            sample["points"] = size
+    summary = profiler.summary()["render"]
+    assert summary["count"] == 3
+    assert summary["points_p50"] == 3.0
+    assert summary["wall_ms_p95"] >= summary["wall_ms_p50"] >= 0
+    profiler.clear()
+    assert profiler.summary() == {}
+
+
+def test_section_records_even_when_the_block_raises():
+    profiler = Profiler()
+    with pytest.raises(RuntimeError):
+        with profiler.section("failing"):
+            raise RuntimeError
+    assert profiler.summary()["failing"]["count"] == 1
+
+
+def test_allocations_are_attributed_to_nested_sections(tracing):
+    assert tracemalloc.is_tracing()
+    keep = []
+    with tracing.section("outer"):
+        with tracing.section("inner"):
+            keep.append(np.ones(2**20))             # 8 MiB kept
+        np.ones(2**21)                              # 16 MiB peak, freed
+    summary = tracing.summary()
+    assert summary["inner"]["alloc_kb_p50"] == pytest.approx(8192, rel=0.05)
+    assert summary["outer"]["alloc_kb_p50"] == pytest.approx(8192, rel=0.05)
+    assert summary["outer"]["peak_kb_p50"] >= 8192 + 16384 * 0.95
+
+
+def test_no_allocation_metrics_without_tracing():
+    profiler = Profiler()
+    with profiler.section("plain"):
+        pass
+    assert set(profiler.summary()["plain"]) == {"count", "wall_ms_p50", "wall_ms_p95"}
+
+
+def test_capture_round_trips_through_pstats(tmp_path):
+    profile = start_capture()
+    assert profile is not None
+    try:
+        sorted(range(1000), key=lambda v: -v)
+    finally:
+        dump = finish_capture(profile)
+    path = tmp_path / "run.prof"
+    path.write_bytes(dump)
+    stats = pstats.Stats(str(path))
+    assert any(name == "<lambda>" for _, _, name in stats.stats)
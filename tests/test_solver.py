@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from hydronet.solver import C, CUSIRSolver, StormEvent, simulate_storm, simulate_sweep
+
+
+def test_sweep_matches_single_runs():
+    intensities = [2.0, 15.0, 40.0]
+    x, states = simulate_sweep(intensities, n_cells=120)
+    assert states.shape == (3, 5, 120)
+    for q, batched in zip(intensities, states):
+        x1, single = simulate_storm(q, n_cells=120)
+        np.testing.assert_array_equal(x, x1)
+        np.testing.assert_allclose(batched, single, rtol=1e-12, atol=1e-15)
+
+
+def test_sweep_honours_dt():
+    _, coarse = simulate_sweep([30.0], n_cells=80, dt=0.05)
+    _, single = simulate_storm(30.0, n_cells=80, dt=0.05)
+    np.testing.assert_allclose(coarse[0], single, rtol=1e-12, atol=1e-15)
+
+
+def test_run_calls_back_every_step():
+    solver = CUSIRSolver(n_cells=50, dt=0.1)
+    times = []
+    solver.run(StormEvent(duration=1.0), callback=lambda t, state: times.append(t))
+    assert len(times) == 10
+    assert times[-1] == pytest.approx(1.0)
+
+
+def test_concentration_stays_non_negative():
+    _, state = simulate_storm(60.0, n_cells=100)
+    assert np.all(np.isfinite(state))
+    assert state[C].min() >= -1e-12
+
+
+def test_rejects_tiny_grids():
+    with pytest.raises(ValueError):
+        CUSIRSolver(n_cells=2)
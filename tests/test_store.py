@@ -0,0 +1,157 @@
+import numpy as np
+
+from hydronet.store import DAY, StoreWriter, TimeSeriesStore
+from hydronet.telemetry import CHANNELS, READING_DTYPE, synthetic_readings
+
+
+def _readings(node, t):
+    rows = np.zeros(len(t), dtype=READING_DTYPE)
+    rows["node"] = node
+    rows["t"] = t
+    rows["pressure"] = np.asarray(t) % 97
+    rows["flow"] = node
+    rows["turbidity"] = np.asarray(t) * 0.5
+    return rows
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_round_trip_through_writer(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    sent = []
+    with StoreWriter(store, segment_rows=500) as writer:
+        for chunk in synthetic_readings(20, 120, start=5 * DAY, chunk_seconds=10):
+            writer.write(chunk)
+            sent.append(chunk)
+    sent = np.concatenate(sent)
+    assert writer.pending_rows == 0
+
+    result = store.query()
+    assert sorted(result) == list(range(20))
+    for node, cols in result.items():
+        expected = sent[sent["node"] == node]
+        np.testing.assert_array_equal(cols["t"], expected["t"])
+        for name in CHANNELS:
+            np.testing.assert_array_equal(cols[name], expected[name])
+
+
+def test_query_range_is_inclusive(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    store.append(_readings(3, np.arange(0.0, 100.0)))
+    result = store.query(nodes=[3], start=10, end=20)
+    np.testing.assert_array_equal(result[3]["t"], np.arange(10.0, 21.0))
+    assert store.query(nodes=[3], start=200) == {}
+
+
+def test_query_merges_overlapping_segments(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    store.append(_readings(1, [0.0, 10.0, 20.0]))
+    # Late or replayed readings land in a second segment spanning the first
+    store.append(_readings(1, [5.0, 15.0, 25.0]))
+    result = store.query(nodes=[1])[1]
+    np.testing.assert_array_equal(result["t"], [0.0, 5.0, 10.0, 15.0, 20.0, 25.0])
+    np.testing.assert_array_equal(result["turbidity"], result["t"] * 0.5)
+
+
+def test_query_spans_days(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    t = np.arange(DAY - 50.0, DAY + 50.0)
+    store.append(_readings(0, t))
+    assert store.days(0) == [0, 1]
+    np.testing.assert_array_equal(store.query(nodes=[0])[0]["t"], t)
+
+
+def test_writer_batches_many_nodes_into_one_segment_each(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    writer = StoreWriter(store, clock=FakeClock())
+    for chunk in synthetic_readings(200, 60):
+        writer.write(chunk)
+    assert store.nodes() == []
+    writer.close()
+    assert all(len(store.segments(node, 0)) == 1 for node in range(200))
+
+
+def test_writer_flushes_by_age(tmp_path):
+    clock = FakeClock()
+    store = TimeSeriesStore(tmp_path)
+    writer = StoreWriter(store, max_age=60.0, clock=clock)
+    writer.write(_readings(4, [1.0, 2.0]))
+    assert writer.pending_rows == 2
+    clock.now = 61.0
+    writer.write(_readings(5, [3.0]))
+    assert store.nodes() == [4]
+    assert writer.pending_rows == 1
+
+
+def test_writer_compacts_a_closed_day(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    writer = StoreWriter(store, segment_rows=10, clock=FakeClock())
+    for start in range(0, 100, 10):
+        writer.write(_readings(2, np.arange(start, start + 10.0)))
+    assert len(store.segments(2, 0)) > 1
+    writer.write(_readings(2, [DAY + 1.0]))
+    assert len(store.segments(2, 0)) == 1
+    writer.close()
+    np.testing.assert_array_equal(store.query(nodes=[2], end=DAY - 1)[2]["t"], np.arange(100.0))
+
+
+def test_writer_flushes_every_earlier_buffered_day(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    writer = StoreWriter(store, clock=FakeClock())
+    writer.write(np.concatenate([_readings(7, [DAY + 10.0]), _readings(8, [DAY + 20.0])]))
+    # A late reading for a day that has already closed is buffered too
+    writer.write(_readings(7, [10.0]))
+    assert store.nodes() == []
+    writer.write(_readings(7, [2 * DAY + 5.0]))
+    assert store.days(7) == [0, 1]
+    assert writer.pending_rows == 2
+    writer.close()
+    assert store.days(7) == [0, 1, 2] and store.days(8) == [1]
+
+
+def test_query_drops_repeated_timestamps(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    store.append(_readings(1, [0.0, 10.0, 20.0]))
+    replay = _readings(1, [10.0, 20.0, 30.0])
+    replay["pressure"] = -1.0
+    store.append(replay)
+    result = store.query(nodes=[1])[1]
+    np.testing.assert_array_equal(result["t"], [0.0, 10.0, 20.0, 30.0])
+    # The first (oldest) copy of a repeated reading wins
+    np.testing.assert_array_equal(result["pressure"], [0.0, 10.0, 20.0, -1.0])
+    store.compact(1, 0)
+    assert len(store.segments(1, 0)) == 1
+    np.testing.assert_array_equal(store.query(nodes=[1])[1]["pressure"], result["pressure"])
+
+
+def test_compaction_hides_replaced_segments(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    for start in (0.0, 100.0, 200.0):
+        store.append(_readings(2, np.arange(start, start + 50.0)))
+    segments = [path for path, _, _ in store.segments(2, 0)]
+    rows = np.concatenate([store._read_segment(path) for path in segments])
+    # A compaction that stopped after writing the merged segment
+    store._write_segment(2, 0, rows, replaces=(1, 3))
+    assert all(path.exists() for path in segments)
+    assert len(store.segments(2, 0)) == 1
+    assert store.query(nodes=[2])[2]["t"].size == 150
+    store.compact(2, 0)
+    assert not any(path.exists() for path in segments)
+
+
+def test_repeated_compaction_keeps_covering_old_segments(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    store.append(_readings(3, [1.0]))
+    store.append(_readings(3, [2.0]))
+    store.compact(3, 0)
+    store.append(_readings(3, [3.0]))
+    store.compact(3, 0)
+    (path, _, _), = store.segments(3, 0)
+    assert path.name.endswith("-r000001-000004")
+    np.testing.assert_array_equal(store.query(nodes=[3])[3]["t"], [1.0, 2.0, 3.0])
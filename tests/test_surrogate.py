@@ -0,0 +1,83 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from hydronet import surrogate
+from hydronet.solver import ModelParams, StormEvent
+from hydronet.surrogate import Surrogate, SurrogateSpec, check, solver_snapshots, train
+
+TINY = SurrogateSpec(n_intensity=4, n_source=2, n_cells=60, snapshots=6, hidden=8, n_basis=4,
+                     n_fourier=2, iterations=40, physics_batch=16)
+
+
+@pytest.fixture(scope="module")
+def model():
+    return train(TINY)
+
+
+def test_solver_snapshots_shapes_and_times():
+    data = solver_snapshots([10.0, 50.0], [1.0, 2.0], TINY)
+    assert data["t"].shape == (6,)
+    assert data["t"][0] == pytest.approx(TINY.t_start)
+    assert data["t"][-1] == pytest.approx(StormEvent().duration)
+    for name in ("C", "U", "I"):
+        assert data[name].shape == (2, 6, 60)
+
+
+def test_step_residual_vanishes_on_solver_data():
+    # The physics loss is the solver's own step, so solver trajectories zero it
+    spec, params, storm = TINY, ModelParams(), StormEvent()
+    n_steps = int(round(storm.duration / spec.dt))
+    data = solver_snapshots([8.0, 70.0], [0.5, 3.0],
+                            dataclasses.replace(spec, snapshots=n_steps, t_start=spec.dt))
+    amplitude = np.array([[4.0], [210.0]])
+    dx = data["x"][1] - data["x"][0]
+    profile = np.exp(-((data["x"] - storm.inlet_km) / storm.inlet_width_km) ** 2)
+    for k in (5, 30, 70):
+        G, G_next = data["C"][:, k] / amplitude, data["C"][:, k + 1] / amplitude
+        i0, w = surrogate._departures(data["U"][:, k], spec.dt, dx)
+        forcing = spec.dt * (params.d1 * surrogate._interpolate(data["I"][:, k], i0, w) / amplitude
+                             + storm.load_per_unit * storm.rainfall(data["t"][k]) * profile)
+        r = ((1 + spec.dt * params.delta) * (G_next - spec.dt * params.alpha * surrogate._d2dx2(G_next, dx))
+             - surrogate._interpolate(G, i0, w) - forcing)
+        assert np.abs(r).max() < 1e-12 * np.abs(G_next).max()
+
+
+def test_interpolation_adjoint():
+    rng = np.random.default_rng(0)
+    F, G = rng.random((3, 40)), rng.random((3, 40))
+    i0, w = surrogate._departures(rng.uniform(0, 200, (3, 40)), 0.025, 0.25)
+    assert np.sum(surrogate._interpolate(F, i0, w) * G) == pytest.approx(
+        np.sum(F * surrogate._interpolate_adjoint(G, i0, w)))
+
+
+def test_predict_broadcasts(model):
+    assert model.predict(20.0).shape == (1, 60)
+    assert model.predict([10.0, 20.0, 40.0], 2.0, 1.0).shape == (3, 60)
+    assert model.predict(20.0, [0.5, 1.0], [0.5, 2.0]).shape == (2, 60)
+    z, amplitude = model.features([10.0, 20.0], [1.0, 2.0], 1.0)
+    assert z.shape == (2, 4 + 2 * TINY.n_fourier)
+    np.testing.assert_allclose(amplitude, [10.0, 40.0])
+    # The network predicts the shape C / amplitude
+    np.testing.assert_allclose(model.predict([10.0, 20.0], [1.0, 2.0], 1.0),
+                               amplitude[:, None] * model.shape(z))
+
+
+def test_save_and_load_round_trip(model, tmp_path):
+    path = tmp_path / "weights.npz"
+    model.save(path)
+    loaded = Surrogate.load(path)
+    assert loaded.t_min == TINY.t_min
+    assert loaded.intensity_range == TINY.intensity_range
+    assert loaded.params == ModelParams()
+    np.testing.assert_array_equal(loaded.predict([5.0, 60.0], 1.5, [0.3, 2.0]),
+                                  model.predict([5.0, 60.0], 1.5, [0.3, 2.0]))
+
+
+def test_check_reports_errors_and_times(model):
+    report = check(model, n_members=8)
+    assert report["members"] == 8
+    assert 0 <= report["rel_l2_mean"] <= report["rel_l2_max"]
+    assert model.t_min <= report["worst_t_h"] <= StormEvent().duration
+    assert report["solver_s"] > 0 and report["surrogate_s"] > 0
@@ -0,0 +1,115 @@
+import json
+
+import numpy as np
+import pytest
+
+from hydronet.telemetry import (CHANNELS, READING_DTYPE, TelemetryBuffer, TelemetryFeed, read_csv,
+                                read_jsonl, synthetic_readings)
+
+
+def _random_chunks(n_nodes, n_chunks, seed=0):
+    """Chunks with uneven per-node counts, some larger than the ring, and stray nodes."""
+    rng = np.random.default_rng(seed)
+    t = np.zeros(n_nodes + 2)
+    for _ in range(n_chunks):
+        node = rng.integers(-1, n_nodes + 1, rng.integers(1, 40))
+        chunk = np.empty(node.size, dtype=READING_DTYPE)
+        chunk["node"] = node
+        # Strictly increasing per node, whatever order the nodes arrive in
+        for i, n in enumerate(node):
+            t[n + 1] += rng.uniform(0.5, 2.0)
+            chunk["t"][i] = t[n + 1]
+        for name in CHANNELS:
+            chunk[name] = rng.normal(50.0, 20.0, node.size)
+        yield chunk
+
+
+def test_window_stats_match_naive_window():
+    n_nodes, capacity = 6, 7
+    buffer = TelemetryBuffer(n_nodes, capacity=capacity, resync_every=10**9)
+    history = [[] for _ in range(n_nodes)]
+    dropped = 0
+    for chunk in _random_chunks(n_nodes, 200):
+        buffer.ingest(chunk)
+        for row in chunk:
+            if 0 <= row["node"] < n_nodes:
+                history[row["node"]].append((row["t"], [row[name] for name in CHANNELS]))
+            else:
+                dropped += 1
+
+    stats = buffer.window_stats()
+    assert buffer.dropped == dropped
+    for node in range(n_nodes):
+        window = history[node][-capacity:]
+        times = np.array([t for t, _ in window])
+        values = np.array([v for _, v in window], dtype=np.float32).astype(np.float64)
+        assert stats["count"][node] == len(window)
+        np.testing.assert_allclose(stats["mean"][node], values.mean(axis=0), rtol=1e-6)
+        np.testing.assert_allclose(stats["std"][node], values.std(axis=0), rtol=1e-4, atol=1e-3)
+        np.testing.assert_array_equal(stats["latest"][node], values[-1])
+        assert stats["latest_t"][node] == times[-1]
+        recent_t, recent_v = buffer.recent(node)
+        np.testing.assert_array_equal(recent_t, times)
+        np.testing.assert_array_equal(recent_v, values.astype(np.float32))
+
+
+def test_resync_agrees_with_incremental_sums():
+    buffer = TelemetryBuffer(50, capacity=30, resync_every=10**9)
+    for chunk in synthetic_readings(50, 200, chunk_seconds=7):
+        buffer.ingest(chunk)
+    before = buffer.window_stats()
+    buffer.resync()
+    after = buffer.window_stats()
+    np.testing.assert_allclose(before["mean"], after["mean"], rtol=1e-9)
+    np.testing.assert_allclose(before["std"], after["std"], rtol=1e-6, atol=1e-6)
+
+
+def test_empty_nodes_report_nan():
+    buffer = TelemetryBuffer(3, capacity=4)
+    chunk = np.zeros(2, dtype=READING_DTYPE)
+    chunk["node"] = [0, 0]
+    chunk["t"] = [1.0, 2.0]
+    buffer.ingest(chunk)
+    stats = buffer.window_stats()
+    assert list(stats["count"]) == [2, 0, 0]
+    assert np.isnan(stats["mean"][1:]).all()
+    assert np.isnan(stats["latest"][1:]).all()
+    assert stats["latest_t"][0] == pytest.approx(2.0)
+
+
+def test_file_readers_round_trip(tmp_path):
+    chunk = next(synthetic_readings(4, 3, chunk_seconds=3))
+    csv_path, jsonl_path = tmp_path / "r.csv", tmp_path / "r.jsonl"
+    with open(csv_path, "w") as fh:
+        fh.write(",".join(READING_DTYPE.names) + "\n")
+        for row in chunk:
+            fh.write(",".join(repr(row[name].item()) for name in READING_DTYPE.names) + "\n")
+    with open(jsonl_path, "w") as fh:
+        for row in chunk:
+            fh.write(json.dumps({name: row[name].item() for name in READING_DTYPE.names}) + "\n\n")
+    for reader, path in ((read_csv, csv_path), (read_jsonl, jsonl_path)):
+        chunks = list(reader(path, chunk_size=5))
+        assert [c.size for c in chunks] == [5, 5, 2]
+        np.testing.assert_array_equal(np.concatenate(chunks), chunk)
+
+
+def test_csv_reader_names_missing_columns(tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text("node,t\n1,2\n")
+    with pytest.raises(ValueError, match="pressure"):
+        list(read_csv(path))
+
+
+def test_feed_pumps_into_buffer_and_sinks():
+    class Sink:
+        rows = 0
+
+        def write(self, chunk):
+            self.rows += chunk.size
+
+    sink = Sink()
+    feed = TelemetryFeed(synthetic_readings(10, 5), TelemetryBuffer(10), sinks=[sink])
+    assert feed.pump(max_chunks=2) == 20
+    assert not feed.exhausted
+    assert feed.pump() == 30
+    assert feed.exhausted and sink.rows == 50